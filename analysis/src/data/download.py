@@ -14,9 +14,11 @@ This script will:
 import os
 import sys
 import logging
+import shutil
 from pathlib import Path
 import zipfile
 import time
+from functools import lru_cache
 from tqdm import tqdm
 
 # Configure logging
@@ -35,13 +37,20 @@ RAW_DATA_DIR = DATA_DIR / "raw"
 KAGGLE_CONFIG_DIR = Path.home() / ".kaggle"
 KAGGLE_CONFIG_FILE = KAGGLE_CONFIG_DIR / "kaggle.json"
 DATASET_NAME = "bosch-production-line-performance"
+COPY_BUFFER_SIZE = 1024 * 1024
 
 def ensure_dirs_exist():
     """Create necessary directories if they don't exist."""
     RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
+@lru_cache(maxsize=1)
 def check_dataset_exists():
-    """Check if the dataset files already exist."""
+    """
+    Check if the dataset files already exist.
+    
+    The result is cached; functions that write to the raw data directory
+    call check_dataset_exists.cache_clear() so the next check looks again.
+    """
     expected_files = [
         "train_numeric.csv",
         "train_categorical.csv",
@@ -53,19 +62,20 @@ def check_dataset_exists():
     ]
     return all((RAW_DATA_DIR / file).exists() for file in expected_files)
 
+def read_kaggle_credentials():
+    """Read the Kaggle username and key from kaggle.json."""
+    import json
+    with open(KAGGLE_CONFIG_FILE, 'r') as f:
+        return json.load(f)
+
 def download_with_kaggle_api():
     """Download the dataset using the Kaggle API."""
     try:
         # Try to import kaggle
         import kaggle
     except ImportError:
-        logger.error("Kaggle API package not found. Installing...")
-        os.system("pip install kaggle")
-        try:
-            import kaggle
-        except ImportError:
-            logger.error("Failed to install Kaggle API package. Please install manually.")
-            return False
+        logger.error("Kaggle API package not found. Install it with: pip install -r requirements.txt")
+        return False
 
     # Check if kaggle.json exists
     if not KAGGLE_CONFIG_FILE.exists():
@@ -74,13 +84,13 @@ def download_with_kaggle_api():
         if not KAGGLE_CONFIG_FILE.exists():
             return False
 
-    # Check kaggle.json permissions
+    # Check kaggle.json permissions (the credentials read here are reused for
+    # the download below)
     try:
-        import json
-        with open(KAGGLE_CONFIG_FILE, 'r') as f:
-            creds = json.load(f)
-            logger.info(f"Found credentials for user: {creds.get('username', 'unknown')}")
+        credentials = read_kaggle_credentials()
+        logger.info(f"Found credentials for user: {credentials.get('username', 'unknown')}")
     except Exception as e:
+        credentials = None
         logger.error(f"Error reading kaggle.json: {e}")
         logger.info("Fixing permissions on kaggle.json...")
         try:
@@ -95,12 +105,12 @@ def download_with_kaggle_api():
             
     # Try alternative Kaggle download method using API directly
     try:
-        # Set Kaggle API environment variables
-        with open(KAGGLE_CONFIG_FILE, 'r') as f:
-            import json
-            credentials = json.load(f)
-            os.environ['KAGGLE_USERNAME'] = credentials['username']
-            os.environ['KAGGLE_KEY'] = credentials['key']
+        # Set Kaggle API environment variables (reading kaggle.json again
+        # only if it couldn't be read before its permissions were fixed)
+        if credentials is None:
+            credentials = read_kaggle_credentials()
+        os.environ['KAGGLE_USERNAME'] = credentials['username']
+        os.environ['KAGGLE_KEY'] = credentials['key']
         
         logger.info(f"Downloading {DATASET_NAME} from Kaggle...")
         
@@ -115,6 +125,7 @@ def download_with_kaggle_api():
             return False
             
         logger.info("Download complete!")
+        check_dataset_exists.cache_clear()
         return True
     except Exception as e:
         logger.error(f"Error downloading dataset: {e}")
@@ -162,7 +173,22 @@ def extract_zip_files():
     for zip_file in RAW_DATA_DIR.glob("*.zip"):
         logger.info(f"Extracting {zip_file.name}...")
         with zipfile.ZipFile(zip_file, 'r') as z:
-            z.extractall(RAW_DATA_DIR)
+            for info in z.infolist():
+                if info.is_dir():
+                    continue
+                
+                # Skip members that would be written outside the data directory
+                target = (RAW_DATA_DIR / info.filename).resolve()
+                if RAW_DATA_DIR.resolve() not in target.parents:
+                    logger.warning(f"Skipping unsafe path in archive: {info.filename}")
+                    continue
+                
+                # Stream each member to disk with 1 MB buffers
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with z.open(info) as src, open(target, 'wb', buffering=COPY_BUFFER_SIZE) as dst:
+                    shutil.copyfileobj(src, dst, length=COPY_BUFFER_SIZE)
+    
+    check_dataset_exists.cache_clear()
 
 def simulate_download():
     """Create placeholder files for testing/demo purposes."""
@@ -180,10 +206,10 @@ def simulate_download():
     for file in placeholder_files:
         file_path = RAW_DATA_DIR / file
         if not file_path.exists():
-            with open(file_path, 'w') as f:
-                f.write(f"# This is a placeholder for {file}\n")
-                f.write("# Replace with actual Bosch dataset file\n")
+            payload = f"# This is a placeholder for {file}\n# Replace with actual Bosch dataset file\n"
+            file_path.write_bytes(payload.encode())
     
+    check_dataset_exists.cache_clear()
     logger.info("Placeholder files created. Replace them with actual dataset files.")
 
 def main():
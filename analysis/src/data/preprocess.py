@@ -10,16 +10,25 @@ This script performs the following operations:
 3. Merge the data files (numeric, categorical, date)
 4. Perform feature selection
 5. Save the processed data
+
+The real Bosch files are processed in row chunks (see stream_process) so the
+full dataset never has to fit in memory; synthetic data is processed in memory.
 """
 
 import os
 import sys
 import logging
 import pickle
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, repeat
 from pathlib import Path
 import pandas as pd
 import numpy as np
-from sklearn.impute import SimpleImputer
+import polars as pl
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 from tqdm import tqdm
 
 # Configure logging
@@ -38,59 +47,305 @@ RAW_DATA_DIR = DATA_DIR / "raw"
 INTERIM_DATA_DIR = DATA_DIR / "interim"
 PROCESSED_DATA_DIR = DATA_DIR / "processed"
 
+# Floating point type used for numeric features (float32 halves memory use;
+# set to np.float64 for full precision)
+NUMERIC_DTYPE = np.float32
+
+# First bytes of the placeholder files written by download.py
+PLACEHOLDER_MARKER = b"# This is a placeholder"
+
+# Chunked processing of the real data: rows per chunk, rows used to fit the
+# imputers, and feature columns per batch when computing correlations and
+# categorical modes
+STREAM_CHUNK_SIZE = 100_000
+IMPUTER_SAMPLE_SIZE = 500_000
+CORRELATION_BATCH_COLUMNS = 100
+MODE_BATCH_COLUMNS = 100
+
+DATA_TYPES = ("numeric", "categorical", "date")
+
 def ensure_dirs_exist():
     """Create necessary directories if they don't exist."""
     INTERIM_DATA_DIR.mkdir(parents=True, exist_ok=True)
     PROCESSED_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-def load_data():
-    """Load the raw data files."""
-    logger.info("Loading raw data files...")
+def is_placeholder_file(file_path):
+    """Check if a raw data file is a placeholder created by download.py."""
+    # Placeholders are tiny, so the real multi-GB files are ruled out by size
+    if file_path.stat().st_size >= 4096:
+        return False
+    
+    # Read just the first bytes of the file and compare them to the marker
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        if hasattr(os, "pread"):
+            magic = os.pread(fd, len(PLACEHOLDER_MARKER), 0)
+        else:
+            # os.pread is not available on Windows
+            magic = os.read(fd, len(PLACEHOLDER_MARKER))
+    finally:
+        os.close(fd)
+    return magic == PLACEHOLDER_MARKER
+
+def get_column_types(file_path, data_type):
+    """
+    Build the pyarrow column types for a raw data file from its header.
+    
+    Numeric and date features are read directly as NUMERIC_DTYPE and
+    categorical features as dictionary-encoded strings (pandas categoricals),
+    so no float64/object copies are created. Fixed types also keep the
+    chunks of a streamed file consistent.
+    """
+    if data_type == "categorical":
+        feature_type = pa.dictionary(pa.int32(), pa.string())
+    else:
+        feature_type = pa.from_numpy_dtype(NUMERIC_DTYPE)
     
-    # Check if files exist
-    required_files = [
-        "train_numeric.csv",
-        "train_categorical.csv",
-        "train_date.csv",
-    ]
-    for file in required_files:
+    with open(file_path, 'r') as f:
+        columns = f.readline().strip().split(",")
+    
+    column_types = {col: feature_type for col in columns}
+    column_types["Id"] = pa.int32()
+    if "Response" in column_types:
+        column_types["Response"] = pa.int8()
+    return column_types
+
+def get_convert_options(column_types=None):
+    """Build the pyarrow CSV conversion options used for the raw data files."""
+    return pacsv.ConvertOptions(
+        column_types=column_types,
+        null_values=[""],
+        strings_can_be_null=True,
+    )
+
+def is_cache_fresh(file_path, column_types=None):
+    """
+    Whether the Parquet cache of a CSV file can be read instead of the CSV.
+    
+    The cache has to be newer than the CSV and, if column_types are given,
+    have those types (so it is rewritten after NUMERIC_DTYPE is changed).
+    """
+    parquet_file = file_path.with_suffix(".parquet")
+    if not (parquet_file.exists() and parquet_file.stat().st_mtime >= file_path.stat().st_mtime):
+        return False
+    if column_types is None:
+        return True
+    schema = pq.read_schema(parquet_file)
+    return dict(zip(schema.names, schema.types)) == column_types
+
+def read_csv_file(file_path, column_types=None):
+    """
+    Read a CSV file into a DataFrame using pyarrow's multi-threaded parser.
+    
+    The parsed table is cached as a Parquet file next to the CSV; later runs
+    read the cache instead until the CSV file or the column types change.
+    """
+    parquet_file = file_path.with_suffix(".parquet")
+    if is_cache_fresh(file_path, column_types):
+        logger.info(f"Reading cached {parquet_file.name}")
+        table = pq.read_table(parquet_file)
+        return table.to_pandas(self_destruct=True)
+    
+    table = pacsv.read_csv(
+        file_path,
+        read_options=pacsv.ReadOptions(use_threads=True, block_size=64 * 1024 * 1024),
+        convert_options=get_convert_options(column_types),
+    )
+    
+    # Completely empty columns are inferred as null type; read them as
+    # NUMERIC_DTYPE NaN (like pandas does) so they are handled as numeric
+    # features
+    numeric_type = pa.from_numpy_dtype(NUMERIC_DTYPE)
+    schema = pa.schema([
+        pa.field(field.name, numeric_type) if pa.types.is_null(field.type) else field
+        for field in table.schema
+    ])
+    table = table.cast(schema)
+    
+    # Cache the parsed table for the next run
+    try:
+        pq.write_table(table, parquet_file, compression="zstd")
+        logger.info(f"Cached {file_path.name} as {parquet_file.name}")
+    except OSError as e:
+        logger.warning(f"Could not cache {file_path.name} as Parquet: {e}")
+    
+    return table.to_pandas(self_destruct=True)
+
+def regroup_batches(batches, schema, chunk_size):
+    """
+    Regroup record batches into Arrow tables of chunk_size rows.
+    
+    pyarrow reads CSV files in blocks of bytes and Parquet files by row
+    group, so the batches are regrouped to give the same number of rows for
+    every file.
+    """
+    buffered = []
+    n_rows = 0
+    for batch in batches:
+        buffered.append(batch)
+        n_rows += batch.num_rows
+        while n_rows >= chunk_size:
+            table = pa.Table.from_batches(buffered, schema=schema)
+            yield table.slice(0, chunk_size)
+            remainder = table.slice(chunk_size)
+            buffered = remainder.to_batches()
+            n_rows = remainder.num_rows
+    
+    if n_rows > 0:
+        yield pa.Table.from_batches(buffered, schema=schema)
+
+def cache_batches(reader, file_path):
+    """
+    Yield the record batches of a CSV reader, caching them as Parquet.
+    
+    The cache (the same file read_csv_file writes) is only put in place once
+    the whole CSV file has been read; if it can't be written, the batches
+    are still yielded.
+    """
+    parquet_file = file_path.with_suffix(".parquet")
+    partial_file = parquet_file.with_suffix(".parquet.partial")
+    try:
+        writer = pq.ParquetWriter(partial_file, reader.schema, compression="zstd")
+    except OSError as e:
+        logger.warning(f"Could not cache {file_path.name} as Parquet: {e}")
+        writer = None
+    
+    complete = False
+    try:
+        for batch in reader:
+            if writer is not None:
+                try:
+                    writer.write_batch(batch)
+                except OSError as e:
+                    logger.warning(f"Could not cache {file_path.name} as Parquet: {e}")
+                    writer.close()
+                    writer = None
+                    partial_file.unlink(missing_ok=True)
+            yield batch
+        complete = True
+    finally:
+        if writer is not None:
+            writer.close()
+            if complete:
+                os.replace(partial_file, parquet_file)
+                logger.info(f"Cached {file_path.name} as {parquet_file.name}")
+            else:
+                partial_file.unlink(missing_ok=True)
+
+def iter_csv_tables(file_path, column_types, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Read a raw data file incrementally, yielding Arrow tables of chunk_size rows.
+    
+    A fresh Parquet cache of the file is read instead of the CSV; otherwise
+    the CSV is parsed and the cache is written for the next run.
+    """
+    if is_cache_fresh(file_path, column_types):
+        parquet_file = file_path.with_suffix(".parquet")
+        logger.info(f"Reading cached {parquet_file.name}")
+        parquet = pq.ParquetFile(parquet_file)
+        yield from regroup_batches(
+            parquet.iter_batches(batch_size=chunk_size), parquet.schema_arrow, chunk_size
+        )
+        return
+    
+    reader = pacsv.open_csv(
+        file_path,
+        read_options=pacsv.ReadOptions(use_threads=True, block_size=16 * 1024 * 1024),
+        convert_options=get_convert_options(column_types),
+    )
+    yield from regroup_batches(cache_batches(reader, file_path), reader.schema, chunk_size)
+
+def iter_aligned_chunks(iterators):
+    """
+    Read the chunks of several files in step, yielding tuples of tables.
+    
+    The files are read concurrently, one thread each (pyarrow releases the
+    GIL while parsing). Every iterator is driven to exhaustion (so the
+    Parquet caches of all the files get written); a ValueError is raised if
+    the files don't have the same number of rows.
+    """
+    with ThreadPoolExecutor(max_workers=len(iterators)) as executor:
+        while True:
+            chunk = tuple(executor.map(next, iterators, repeat(None)))
+            if all(table is None for table in chunk):
+                return
+            if any(table is None for table in chunk) or len({table.num_rows for table in chunk}) > 1:
+                raise ValueError("The raw data files don't have the same number of rows")
+            yield chunk
+
+def iter_csv_chunks(file_path, column_types, chunk_size=STREAM_CHUNK_SIZE):
+    """Read a CSV file incrementally, yielding DataFrames of chunk_size rows."""
+    for table in iter_csv_tables(file_path, column_types, chunk_size):
+        yield table.to_pandas()
+
+def count_missing_values(table):
+    """
+    Per-column missing value counts of an Arrow table.
+    
+    Arrow keeps the null count of every array, so no data is scanned.
+    """
+    return pd.Series(
+        [column.null_count for column in table.columns],
+        index=table.column_names,
+        dtype=np.int64
+    )
+
+def consume(items):
+    """Yield the items of a list first to last, removing them from the list."""
+    while items:
+        yield items.pop(0)
+
+def check_required_files():
+    """Exit if any of the raw training files is missing."""
+    for data_type in DATA_TYPES:
+        file = f"train_{data_type}.csv"
         if not (RAW_DATA_DIR / file).exists():
             logger.error(f"Required file {file} not found in {RAW_DATA_DIR}")
             logger.info("Please run the download.py script first.")
             sys.exit(1)
+
+def load_data():
+    """Load the raw data files."""
+    logger.info("Loading raw data files...")
+    
+    # Check if files exist
+    check_required_files()
     
     # Check if these are placeholder files
-    with open(RAW_DATA_DIR / "train_numeric.csv", 'r') as f:
-        first_line = f.readline().strip()
-        if first_line.startswith("# This is a placeholder"):
-            logger.info("Detected placeholder files. Generating synthetic data instead...")
-            return generate_synthetic_data()
+    if is_placeholder_file(RAW_DATA_DIR / "train_numeric.csv"):
+        logger.info("Detected placeholder files. Generating synthetic data instead...")
+        return generate_synthetic_data()
     
-    # Load the real data
+    # Load the real data (the three files are read concurrently)
     try:
-        train_numeric = pd.read_csv(RAW_DATA_DIR / "train_numeric.csv")
-        train_categorical = pd.read_csv(RAW_DATA_DIR / "train_categorical.csv")
-        train_date = pd.read_csv(RAW_DATA_DIR / "train_date.csv")
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = {}
+            for data_type in DATA_TYPES:
+                file_path = RAW_DATA_DIR / f"train_{data_type}.csv"
+                futures[data_type] = executor.submit(
+                    read_csv_file, file_path, get_column_types(file_path, data_type)
+                )
+            data = {data_type: future.result() for data_type, future in futures.items()}
         
-        logger.info(f"Loaded train_numeric.csv: {train_numeric.shape}")
-        logger.info(f"Loaded train_categorical.csv: {train_categorical.shape}")
-        logger.info(f"Loaded train_date.csv: {train_date.shape}")
+        for data_type, df in data.items():
+            logger.info(f"Loaded train_{data_type}.csv: {df.shape}")
         
-        return {
-            "numeric": train_numeric,
-            "categorical": train_categorical,
-            "date": train_date,
-        }
+        return data
     except Exception as e:
         logger.error(f"Error loading data: {e}")
         sys.exit(1)
 
-def generate_synthetic_data():
-    """Generate synthetic data for development purposes."""
+def generate_synthetic_data(dump_reference=None):
+    """
+    Generate synthetic data for development purposes.
+    
+    If dump_reference is True (defaults to the BOSCH_DUMP_SYNTHETIC=1 environment
+    variable), the generated data is also saved as Feather files for reference.
+    """
     logger.info("Generating synthetic Bosch production line data...")
     
-    # Set random seed for reproducibility
-    np.random.seed(42)
+    # Seeded random generator for reproducibility
+    rng = np.random.default_rng(42)
     
     # Number of samples
     n_samples = 10000
@@ -100,35 +355,35 @@ def generate_synthetic_data():
     numeric_column_names = ["Id"] + ["L0_S0_F" + str(i) for i in range(numeric_features)] + ["Response"]
     
     # Generate IDs
-    ids = np.arange(n_samples)
+    ids = np.arange(n_samples, dtype=np.int32)
     
     # Generate feature values (normally distributed)
-    features = np.random.normal(0, 1, size=(n_samples, numeric_features))
+    features = rng.standard_normal(size=(n_samples, numeric_features), dtype=NUMERIC_DTYPE)
     
     # Generate binary response (imbalanced, about 1% failure rate)
-    responses = np.random.choice([0, 1], size=n_samples, p=[0.99, 0.01])
+    responses = rng.choice(np.array([0, 1], dtype=np.int8), size=n_samples, p=[0.99, 0.01])
     
-    # Combine into DataFrame
-    numeric_data = pd.DataFrame(
-        np.column_stack([ids, features, responses]), 
-        columns=numeric_column_names
-    )
+    # Combine into DataFrame (typed columns, no float64 intermediate)
+    numeric_data = pd.DataFrame(features, columns=numeric_column_names[1:-1])
+    numeric_data.insert(0, "Id", ids)
+    numeric_data["Response"] = responses
     
     # Create synthetic categorical data
     categorical_features = 20
     categorical_column_names = ["Id"] + ["L0_S0_C" + str(i) for i in range(categorical_features)]
     
-    # Generate categorical values (3-5 categories per feature)
-    categorical_values = []
-    for i in range(categorical_features):
-        n_categories = np.random.randint(3, 6)
-        categorical_values.append(np.random.choice([f"Cat_{j}" for j in range(n_categories)], size=n_samples))
+    # Generate categorical values (3-5 categories per feature) as category
+    # codes for all features in a single draw
+    n_categories = rng.integers(3, 6, size=categorical_features)
+    codes = (rng.random((n_samples, categorical_features)) * n_categories).astype(np.int8)
+    categories = np.array([f"Cat_{j}" for j in range(n_categories.max())])
     
-    # Combine into DataFrame
-    categorical_data = pd.DataFrame(
-        np.column_stack([ids, np.column_stack(categorical_values)]),
-        columns=categorical_column_names
-    )
+    # Combine into DataFrame (dictionary-encoded, no per-cell strings)
+    categorical_data = pd.DataFrame({
+        name: pd.Categorical.from_codes(codes[:, i], categories=categories[:n_categories[i]])
+        for i, name in enumerate(categorical_column_names[1:])
+    })
+    categorical_data.insert(0, "Id", ids)
     
     # Create synthetic date data
     date_features = 10
@@ -138,37 +393,29 @@ def generate_synthetic_data():
     base_date = pd.Timestamp('2023-01-01')
     
     # Generate date values (sequential through production line)
-    date_values = []
-    current_date = base_date
-    for i in range(date_features):
-        # Add some random time increment for each station (1-30 minutes)
-        dates = [current_date + pd.Timedelta(minutes=np.random.randint(1, 30)) * (j+1) for j in range(n_samples)]
-        date_values.append([d.strftime("%Y-%m-%d %H:%M:%S") for d in dates])
-        current_date = current_date + pd.Timedelta(minutes=30)
-    
-    # Combine into DataFrame
-    date_data = pd.DataFrame(
-        np.column_stack([ids, np.column_stack(date_values)]),
-        columns=date_column_names
-    )
-    
-    # Convert ID column to integer in all dataframes
-    numeric_data["Id"] = numeric_data["Id"].astype(int)
-    categorical_data["Id"] = categorical_data["Id"].astype(int)
-    date_data["Id"] = date_data["Id"].astype(int)
+    # Each station starts 30 minutes after the previous one and every sample
+    # gets a random time increment (1-30 minutes) scaled by its position.
+    increments = rng.integers(1, 30, size=(n_samples, date_features))
+    minutes = increments * np.arange(1, n_samples + 1)[:, None] + 30 * np.arange(date_features)
+    date_values = np.datetime64(base_date, "ns") + minutes.astype("timedelta64[m]")
     
-    # Convert Response column to integer
-    numeric_data["Response"] = numeric_data["Response"].astype(int)
+    # Combine into DataFrame (kept as datetime64, no per-cell string formatting)
+    date_data = pd.DataFrame(date_values, columns=date_column_names[1:])
+    date_data.insert(0, "Id", ids)
     
     logger.info(f"Generated synthetic numeric data: {numeric_data.shape}")
     logger.info(f"Generated synthetic categorical data: {categorical_data.shape}")
     logger.info(f"Generated synthetic date data: {date_data.shape}")
     
-    # Save the synthetic data to CSV (for reference)
-    INTERIM_DATA_DIR.mkdir(parents=True, exist_ok=True)
-    numeric_data.to_csv(INTERIM_DATA_DIR / "synthetic_numeric.csv", index=False)
-    categorical_data.to_csv(INTERIM_DATA_DIR / "synthetic_categorical.csv", index=False)
-    date_data.to_csv(INTERIM_DATA_DIR / "synthetic_date.csv", index=False)
+    # Save the synthetic data to Feather (for reference, only if requested)
+    if dump_reference is None:
+        dump_reference = os.environ.get("BOSCH_DUMP_SYNTHETIC") == "1"
+    if dump_reference:
+        INTERIM_DATA_DIR.mkdir(parents=True, exist_ok=True)
+        numeric_data.to_feather(INTERIM_DATA_DIR / "synthetic_numeric.feather")
+        categorical_data.to_feather(INTERIM_DATA_DIR / "synthetic_categorical.feather")
+        date_data.to_feather(INTERIM_DATA_DIR / "synthetic_date.feather")
+        logger.info(f"Synthetic reference data saved to {INTERIM_DATA_DIR}")
     
     return {
         "numeric": numeric_data,
@@ -181,97 +428,163 @@ def analyze_missing_values(data):
     logger.info("Analyzing missing values...")
     
     for data_type, df in data.items():
-        logger.info(f"Missing values in {data_type} data:")
-        missing = df.isnull().sum()
-        missing_percent = 100 * missing / len(df)
-        missing_info = pd.DataFrame({
-            'missing_count': missing,
-            'missing_percent': missing_percent
-        })
-        logger.info(f"Total columns with missing values: {sum(missing > 0)}")
-        
-        # Save missing value analysis
-        missing_file = INTERIM_DATA_DIR / f"missing_values_{data_type}.csv"
-        missing_info.to_csv(missing_file)
-        logger.info(f"Missing value analysis saved to {missing_file}")
+        missing_info = save_missing_value_analysis(data_type, df.isnull().sum(), len(df))
     
     return missing_info
 
-def handle_missing_values(data):
-    """Handle missing values in the dataset."""
-    logger.info("Handling missing values...")
+def save_missing_value_analysis(data_type, missing, n_rows):
+    """Save the per-column missing value counts of one data file."""
+    logger.info(f"Missing values in {data_type} data:")
+    missing_percent = 100 * missing / n_rows
+    missing_info = pd.DataFrame({
+        'missing_count': missing,
+        'missing_percent': missing_percent
+    })
+    logger.info(f"Total columns with missing values: {sum(missing > 0)}")
+    
+    # Save missing value analysis
+    missing_file = INTERIM_DATA_DIR / f"missing_values_{data_type}.csv"
+    missing_info.to_csv(missing_file)
+    logger.info(f"Missing value analysis saved to {missing_file}")
+    return missing_info
+
+def get_feature_columns(columns):
+    """Split column names into the Id column, Response column (or None) and features."""
+    columns = list(columns)
+    id_col = "Id" if "Id" in columns else columns[0]
+    response_col = "Response" if "Response" in columns else None
+    feature_cols = [col for col in columns if col not in (id_col, response_col)]
+    return id_col, response_col, feature_cols
+
+def column_median(values):
+    """
+    Median of the non-missing values of a single column.
+    
+    Columns without any observed value have no median; 0 is returned so that
+    they are filled with 0.
+    """
+    observed = values[~np.isnan(values)]
+    n = len(observed)
+    if n == 0:
+        return 0.0
+    
+    # Partial sorts are enough to find the middle value(s)
+    k = n // 2
+    if n % 2:
+        return np.partition(observed, k)[k]
+    observed = np.partition(observed, [k - 1, k])
+    return (observed[k - 1] + observed[k]) / 2
+
+def fit_imputers(data):
+    """
+    Compute the values used to fill in missing numeric and categorical values.
+    
+    Numeric features are filled with the column medians and categorical
+    features with the most frequent category. The fitted values are saved
+    to the interim data directory for later use.
+    """
+    logger.info("Fitting missing value imputers...")
+    
+    # Column medians of the numeric features, one column per task
+    # (to_numpy returns a column-major array, so each column is contiguous)
+    _, _, numeric_cols = get_feature_columns(data["numeric"].columns)
+    values = data["numeric"][numeric_cols].to_numpy(dtype=NUMERIC_DTYPE)
+    with ThreadPoolExecutor() as executor:
+        medians = np.fromiter(
+            executor.map(column_median, (values[:, i] for i in range(values.shape[1]))),
+            dtype=NUMERIC_DTYPE,
+            count=values.shape[1]
+        )
+    numeric_imputer = {"medians": medians, "columns": numeric_cols}
+    
+    # Most frequent value of the categorical features, computed with one
+    # bincount over the integer category codes of a batch of columns (each
+    # column's codes are offset so that they fall in a separate range of bins)
+    _, _, categorical_cols = get_feature_columns(data["categorical"].columns)
+    modes = {}
+    for start in range(0, len(categorical_cols), MODE_BATCH_COLUMNS):
+        batch_cols = categorical_cols[start:start + MODE_BATCH_COLUMNS]
+        columns = [pd.Categorical(data["categorical"][col]) for col in batch_cols]
+        n_bins = max(len(values.categories) for values in columns) + 1
+        codes = np.stack([values.codes for values in columns], axis=1).astype(np.int32)
+        # Missing values (code -1) go to the last bin of each column, which is ignored
+        codes[codes < 0] = n_bins - 1
+        codes += np.arange(len(columns), dtype=np.int32) * n_bins
+        counts = np.bincount(codes.ravel(), minlength=len(columns) * n_bins)
+        counts = counts.reshape(len(columns), n_bins)[:, :-1]
+        for col, values, col_counts in zip(batch_cols, columns, counts):
+            if col_counts.any():
+                modes[col] = values.categories[col_counts.argmax()]
+    categorical_imputer = {"modes": modes, "columns": categorical_cols}
+    
+    # Save the imputation values for later use
+    with open(INTERIM_DATA_DIR / "numeric_imputer.pkl", 'wb') as f:
+        pickle.dump(numeric_imputer, f)
+    with open(INTERIM_DATA_DIR / "categorical_imputer.pkl", 'wb') as f:
+        pickle.dump(categorical_imputer, f)
     
-    processed_data = {}
+    return {"numeric": numeric_imputer, "categorical": categorical_imputer}
+
+def handle_missing_values(data, imputers=None):
+    """
+    Handle missing values in the dataset.
     
-    # Handle numeric data
-    numeric_df = data["numeric"].copy()
+    The imputers are fitted on the data itself unless previously fitted
+    imputers (from fit_imputers) are given.
+    """
+    logger.info("Handling missing values...")
     
-    # Get column names for Id and Response
-    id_col = "Id" if "Id" in numeric_df.columns else numeric_df.columns[0]
-    response_col = "Response" if "Response" in numeric_df.columns else None
+    if imputers is None:
+        imputers = fit_imputers(data)
     
-    # Separate features from Id and Response
-    if response_col:
-        numeric_features = numeric_df.drop([id_col, response_col], axis=1)
-    else:
-        numeric_features = numeric_df.drop([id_col], axis=1)
+    processed_data = {}
     
-    # Impute missing values for numeric features
-    logger.info("Imputing missing values for numeric features...")
-    numeric_imputer = SimpleImputer(strategy='median')
-    numeric_features_imputed = pd.DataFrame(
-        numeric_imputer.fit_transform(numeric_features),
-        columns=numeric_features.columns
-    )
+    # Handle numeric data (the input frames are only read, never modified,
+    # so they are not copied)
+    numeric_df = data["numeric"]
+    id_col, response_col, numeric_cols = get_feature_columns(numeric_df.columns)
     
-    # Save the imputer for later use
-    with open(INTERIM_DATA_DIR / "numeric_imputer.pkl", 'wb') as f:
-        pickle.dump(numeric_imputer, f)
+    # Impute missing values for numeric features with the column medians
+    # (features are down-cast to NUMERIC_DTYPE to reduce memory traffic); the
+    # medians are written into the one new buffer, which backs the result frame
+    logger.info("Imputing missing values for numeric features...")
+    numeric_values = numeric_df[numeric_cols].to_numpy(dtype=NUMERIC_DTYPE, copy=True)
+    np.copyto(numeric_values, imputers["numeric"]["medians"], where=np.isnan(numeric_values))
+    numeric_df_processed = pd.DataFrame(numeric_values, columns=numeric_cols, copy=False)
     
-    # Reconstruct the dataframe with Id and Response
+    # Put back Id and Response in front of the features
+    numeric_df_processed.insert(0, id_col, numeric_df[id_col].to_numpy())
     if response_col:
-        numeric_df_processed = pd.concat([
-            numeric_df[[id_col, response_col]].reset_index(drop=True),
-            numeric_features_imputed.reset_index(drop=True)
-        ], axis=1)
-    else:
-        numeric_df_processed = pd.concat([
-            numeric_df[[id_col]].reset_index(drop=True),
-            numeric_features_imputed.reset_index(drop=True)
-        ], axis=1)
+        numeric_df_processed.insert(1, response_col, numeric_df[response_col].to_numpy())
     
     processed_data["numeric"] = numeric_df_processed
     
     # Handle categorical data
-    categorical_df = data["categorical"].copy()
-    
-    # Separate features from Id
-    categorical_features = categorical_df.drop([id_col], axis=1)
+    categorical_df = data["categorical"]
+    _, _, categorical_cols = get_feature_columns(categorical_df.columns)
     
-    # Impute missing values for categorical features
+    # Impute missing values for categorical features with the most frequent value
+    # (filled in on the integer category codes rather than on strings)
     logger.info("Imputing missing values for categorical features...")
-    categorical_imputer = SimpleImputer(strategy='most_frequent')
-    categorical_features_imputed = pd.DataFrame(
-        categorical_imputer.fit_transform(categorical_features),
-        columns=categorical_features.columns
-    )
-    
-    # Save the imputer for later use
-    with open(INTERIM_DATA_DIR / "categorical_imputer.pkl", 'wb') as f:
-        pickle.dump(categorical_imputer, f)
-    
-    # Reconstruct the dataframe with Id
-    categorical_df_processed = pd.concat([
-        categorical_df[[id_col]].reset_index(drop=True),
-        categorical_features_imputed.reset_index(drop=True)
-    ], axis=1)
-    
-    processed_data["categorical"] = categorical_df_processed
+    modes = imputers["categorical"]["modes"]
+    categorical_columns = {id_col: categorical_df[id_col].to_numpy()}
+    for col in categorical_cols:
+        values = pd.Categorical(categorical_df[col])
+        missing = values.codes < 0
+        if col in modes and missing.any():
+            if modes[col] not in values.categories:
+                values = values.add_categories([modes[col]])
+            codes = values.codes.copy()
+            codes[missing] = values.categories.get_loc(modes[col])
+            values = pd.Categorical.from_codes(codes, categories=values.categories)
+        categorical_columns[col] = values
+    
+    # Build the Id and imputed features into a single frame
+    processed_data["categorical"] = pd.DataFrame(categorical_columns)
     
     # Handle date data (if needed)
     if "date" in data and not data["date"].empty:
-        date_df = data["date"].copy()
-        processed_data["date"] = date_df
+        processed_data["date"] = data["date"]
     
     return processed_data
 
@@ -285,19 +598,93 @@ def merge_datasets(processed_data):
     # Identify the ID column name
     id_col = "Id" if "Id" in merged_df.columns else merged_df.columns[0]
     
-    # Merge with categorical data
-    if "categorical" in processed_data and not processed_data["categorical"].empty:
-        categorical_df = processed_data["categorical"]
-        merged_df = pd.merge(merged_df, categorical_df, on=id_col, how='left')
+    # Collect the datasets to join onto the numeric data
+    other_dfs = [
+        processed_data[data_type]
+        for data_type in ("categorical", "date")
+        if data_type in processed_data and not processed_data[data_type].empty
+    ]
     
-    # Merge with date data
-    if "date" in processed_data and not processed_data["date"].empty:
-        date_df = processed_data["date"]
-        merged_df = pd.merge(merged_df, date_df, on=id_col, how='left')
+    # The Bosch files list the same Ids in the same order, so the frames can
+    # be concatenated column-wise; only fall back to a join when Ids differ
+    ids = merged_df[id_col].to_numpy()
+    if all(np.array_equal(df[id_col].to_numpy(), ids) for df in other_dfs):
+        merged_df = pd.concat(
+            [merged_df.reset_index(drop=True)]
+            + [df.drop(columns=[id_col]).reset_index(drop=True) for df in other_dfs],
+            axis=1
+        )
+    else:
+        # Left-join in Polars, which avoids the per-column copies of pd.merge
+        merged = pl.from_pandas(merged_df)
+        for df in other_dfs:
+            merged = merged.join(pl.from_pandas(df), on=id_col, how='left')
+        merged_df = merged.to_pandas()
     
     logger.info(f"Merged dataset shape: {merged_df.shape}")
     return merged_df
 
+def compute_target_correlation(X, y):
+    """
+    Compute the Pearson correlation of every column of X with y.
+    
+    Missing values in X are excluded pairwise, like DataFrame.corrwith, but all
+    columns are handled at once with matrix-vector products. X is modified in place.
+    """
+    missing = np.isnan(X)
+    n_observed = len(X) - missing.sum(axis=0)
+    
+    with warnings.catch_warnings(), np.errstate(divide='ignore', invalid='ignore'):
+        # All-missing and constant columns have no defined correlation
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        undefined = (n_observed < 2) | ~(np.nanmax(X, axis=0) > np.nanmin(X, axis=0))
+        
+        # Centre the data first to keep the single precision sums accurate
+        X -= np.nanmean(X, axis=0)
+        np.copyto(X, 0, where=missing)
+        y = y - y.mean()
+        
+        # Sums of y over the rows observed in each column; only the columns
+        # with missing values need the masked matrix-vector products
+        sum_y = np.full(X.shape[1], y.sum(), dtype=X.dtype)
+        sum_yy = np.full(X.shape[1], (y * y).sum(), dtype=X.dtype)
+        partial = n_observed < len(X)
+        if partial.any():
+            observed = (~missing[:, partial]).astype(X.dtype)
+            sum_y[partial] = y @ observed
+            sum_yy[partial] = (y * y) @ observed
+        sum_x = X.sum(axis=0)
+        sum_xx = np.einsum('ij,ij->j', X, X)
+        
+        cov = X.T @ y - sum_x * sum_y / n_observed
+        var_x = sum_xx - sum_x ** 2 / n_observed
+        var_y = sum_yy - sum_y ** 2 / n_observed
+        correlation = np.clip(cov / np.sqrt(var_x * var_y), -1, 1)
+    
+    correlation[undefined] = np.nan
+    return correlation
+
+def select_important_features(correlation):
+    """Select the features most correlated with Response and save the correlations."""
+    abs_correlation = correlation.abs().sort_values(ascending=False)
+    
+    # Select top features (example: top 100 or those with correlation > 0.05)
+    # In a real project, you would tune this threshold
+    important_features = abs_correlation[abs_correlation > 0.01].index.tolist()
+    
+    # Log feature selection results
+    logger.info(f"Selected {len(important_features)} important features")
+    
+    # Save feature importance/correlation
+    correlation_df = pd.DataFrame({
+        'feature': correlation.index,
+        'correlation': correlation.values,
+        'abs_correlation': correlation.abs().values
+    }).sort_values('abs_correlation', ascending=False)
+    
+    correlation_df.to_csv(INTERIM_DATA_DIR / "feature_correlation.csv", index=False)
+    return important_features
+
 def feature_selection(merged_df):
     """Perform feature selection on the merged dataset."""
     logger.info("Performing feature selection...")
@@ -318,24 +705,14 @@ def feature_selection(merged_df):
     numeric_features = features.select_dtypes(include=np.number).columns
     
     # Calculate correlation for numeric features
-    correlation = merged_df[numeric_features].corrwith(merged_df[response_col])
-    abs_correlation = correlation.abs().sort_values(ascending=False)
-    
-    # Select top features (example: top 100 or those with correlation > 0.05)
-    # In a real project, you would tune this threshold
-    important_features = abs_correlation[abs_correlation > 0.01].index.tolist()
-    
-    # Log feature selection results
-    logger.info(f"Selected {len(important_features)} important features")
-    
-    # Save feature importance/correlation
-    correlation_df = pd.DataFrame({
-        'feature': correlation.index,
-        'correlation': correlation.values,
-        'abs_correlation': abs_correlation.values
-    }).sort_values('abs_correlation', ascending=False)
-    
-    correlation_df.to_csv(INTERIM_DATA_DIR / "feature_correlation.csv", index=False)
+    correlation = pd.Series(
+        compute_target_correlation(
+            merged_df[numeric_features].to_numpy(dtype=np.float32, copy=True),
+            merged_df[response_col].to_numpy(dtype=np.float32)
+        ),
+        index=numeric_features
+    )
+    important_features = select_important_features(correlation)
     
     # Create dataset with selected features
     selected_columns = [id_col, response_col] + important_features
@@ -348,21 +725,141 @@ def save_processed_data(processed_df, dataset_type="train"):
     """Save the processed dataset."""
     logger.info(f"Saving processed {dataset_type} data...")
     
-    # Save as CSV
-    csv_file = PROCESSED_DATA_DIR / f"{dataset_type}_processed.csv"
-    processed_df.to_csv(csv_file, index=False)
-    logger.info(f"Saved to {csv_file}")
+    # Save as Parquet (compact, fast to write and supports column-pruned reads)
+    parquet_file = PROCESSED_DATA_DIR / f"{dataset_type}_processed.parquet"
+    processed_df.to_parquet(
+        parquet_file,
+        engine="pyarrow",
+        compression="zstd",
+        compression_level=3,
+        row_group_size=100_000,
+        index=False,
+    )
+    logger.info(f"Saved to {parquet_file}")
+
+def stream_process(chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Preprocess the raw training files in row chunks to bound memory use.
+    
+    The three files (which list the same Ids in the same order) are read
+    chunk by chunk in step, from their Parquet caches if fresh. The imputers
+    are fitted on the first IMPUTER_SAMPLE_SIZE rows, then each chunk is
+    imputed, merged and appended to an interim Parquet file. Feature
+    selection reads that file a batch of columns at a time and the selected
+    columns are streamed into the processed dataset.
+    """
+    logger.info(f"Processing raw data files in chunks of {chunk_size} rows...")
+    file_paths = {data_type: RAW_DATA_DIR / f"train_{data_type}.csv" for data_type in DATA_TYPES}
+    column_types = {
+        data_type: get_column_types(file_path, data_type)
+        for data_type, file_path in file_paths.items()
+    }
+    
+    chunks = iter_aligned_chunks([
+        iter_csv_tables(file_paths[data_type], column_types[data_type], chunk_size)
+        for data_type in DATA_TYPES
+    ])
+    
+    # Fit the imputers on the first rows, keeping the chunks read for that
+    # to process them first (so the files are only read once)
+    sample_chunks = []
+    n_sample_rows = 0
+    for chunk in chunks:
+        sample_chunks.append(chunk)
+        n_sample_rows += chunk[0].num_rows
+        if n_sample_rows >= IMPUTER_SAMPLE_SIZE:
+            break
+    sample = {
+        data_type: pa.concat_tables([chunk[i] for chunk in sample_chunks]).slice(0, IMPUTER_SAMPLE_SIZE).to_pandas()
+        for i, data_type in enumerate(DATA_TYPES)
+    }
+    imputers = fit_imputers(sample)
+    del sample
+    chunks = chain(consume(sample_chunks), chunks)
+    
+    # Impute and merge each chunk, appending it to the interim merged file
+    merged_file = INTERIM_DATA_DIR / "train_merged.parquet"
+    missing = dict.fromkeys(DATA_TYPES, 0)
+    n_rows = 0
+    writer = None
+    try:
+        for chunk in tqdm(chunks, desc="Processing chunks", unit="chunk"):
+            # Count the missing values on the Arrow tables, before conversion
+            data = {}
+            for data_type, table in zip(DATA_TYPES, chunk):
+                missing[data_type] = missing[data_type] + count_missing_values(table)
+                data[data_type] = table.to_pandas()
+            n_rows += len(data["numeric"])
+            
+            merged_df = merge_datasets(handle_missing_values(data, imputers))
+            table = pa.Table.from_pandas(merged_df, preserve_index=False)
+            if writer is None:
+                # Use wide dictionary indices so chunks with more categories still fit
+                schema = pa.schema([
+                    pa.field(field.name, pa.dictionary(pa.int32(), pa.string()))
+                    if pa.types.is_dictionary(field.type) else field
+                    for field in table.schema
+                ])
+                writer = pq.ParquetWriter(merged_file, schema, compression="zstd")
+            writer.write_table(table.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+    logger.info(f"Merged dataset ({n_rows} rows) saved to {merged_file}")
+    
+    # Analyze missing values
+    for data_type in DATA_TYPES:
+        save_missing_value_analysis(data_type, missing[data_type], n_rows)
+    
+    # Feature selection, computing correlations a batch of columns at a time
+    merged_parquet = pq.ParquetFile(merged_file)
+    schema = merged_parquet.schema_arrow
+    id_col, response_col, feature_cols = get_feature_columns(schema.names)
+    if response_col:
+        logger.info("Performing feature selection...")
+        numeric_features = [
+            col for col in feature_cols
+            if pa.types.is_floating(schema.field(col).type) or pa.types.is_integer(schema.field(col).type)
+        ]
+        y = merged_parquet.read(columns=[response_col]).column(0).to_numpy().astype(np.float32)
+        correlation = []
+        for start in range(0, len(numeric_features), CORRELATION_BATCH_COLUMNS):
+            table = merged_parquet.read(columns=numeric_features[start:start + CORRELATION_BATCH_COLUMNS])
+            X = np.column_stack([column.to_numpy() for column in table.columns]).astype(np.float32, copy=False)
+            correlation.append(compute_target_correlation(X, y))
+        correlation = pd.Series(
+            np.concatenate(correlation) if correlation else np.array([], dtype=np.float32),
+            index=numeric_features
+        )
+        selected_columns = [id_col, response_col] + select_important_features(correlation)
+        dataset_type = "train"
+    else:
+        selected_columns = schema.names
+        dataset_type = "test"
     
-    # Save as pickle for faster loading
-    pickle_file = PROCESSED_DATA_DIR / f"{dataset_type}_processed.pkl"
-    processed_df.to_pickle(pickle_file)
-    logger.info(f"Saved to {pickle_file}")
+    # Stream the selected columns into the processed dataset
+    logger.info(f"Saving processed {dataset_type} data...")
+    parquet_file = PROCESSED_DATA_DIR / f"{dataset_type}_processed.parquet"
+    selected_schema = pa.schema([schema.field(col) for col in selected_columns])
+    with pq.ParquetWriter(parquet_file, selected_schema, compression="zstd", compression_level=3) as writer:
+        for batch in merged_parquet.iter_batches(batch_size=chunk_size, columns=selected_columns):
+            writer.write_batch(batch)
+    logger.info(f"Dataset after feature selection: ({n_rows}, {len(selected_columns)})")
+    logger.info(f"Saved to {parquet_file}")
 
 def main():
     """Main function to preprocess the Bosch dataset."""
     logger.info("Starting Bosch dataset preprocessing...")
     ensure_dirs_exist()
     
+    # The real data is processed in chunks; placeholder files are replaced
+    # by synthetic data, which is small enough to process in memory
+    check_required_files()
+    if not is_placeholder_file(RAW_DATA_DIR / "train_numeric.csv"):
+        stream_process()
+        logger.info("Preprocessing completed successfully.")
+        return
+    
     # Load data
     data = load_data()
     
@@ -24,22 +24,40 @@ import pickle
 from pathlib import Path
 import pandas as pd
 import numpy as np
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+import matplotlib
+matplotlib.use("Agg")  # Plots are only saved to files, never shown
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.ensemble import IsolationForest
-from sklearn.neighbors import LocalOutlierFactor
-from sklearn.svm import OneClassSVM
+from sklearn.neighbors import NearestNeighbors
+from sklearn.linear_model import SGDOneClassSVM
+from sklearn.kernel_approximation import Nystroem
+from sklearn.pipeline import make_pipeline
 from sklearn.covariance import EllipticEnvelope
-from sklearn.metrics import confusion_matrix, classification_report
+from sklearn.metrics import confusion_matrix
 from sklearn.decomposition import PCA
+from joblib import Parallel, delayed
 from tqdm import tqdm
 
+# Approximate nearest neighbours for LOF (optional, exact search otherwise)
+try:
+    from pynndescent import NNDescent
+except ImportError:
+    NNDescent = None
+
+def configure_logging():
+    """Configure logging (also called in the worker processes of main)."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler(sys.stdout)],
+    )
+
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)],
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Define paths
@@ -51,65 +69,59 @@ MODELS_DIR = ROOT_DIR / "models"
 RESULTS_DIR = ROOT_DIR / "results"
 PLOTS_DIR = RESULTS_DIR / "plots"
 
+# Maximum number of points drawn in the PCA scatter plots
+PLOT_SAMPLE_SIZE = 50_000
+
 def ensure_dirs_exist():
     """Create necessary directories if they don't exist."""
     MODELS_DIR.mkdir(parents=True, exist_ok=True)
     RESULTS_DIR.mkdir(parents=True, exist_ok=True)
     PLOTS_DIR.mkdir(parents=True, exist_ok=True)
 
-def load_processed_data(dataset_type="train"):
-    """Load the processed dataset."""
+def load_processed_data(dataset_type="train", columns=None):
+    """Load the processed dataset, optionally reading only the given columns."""
     logger.info(f"Loading processed {dataset_type} data...")
     
-    # Try loading the pickle file first (faster)
-    pickle_file = PROCESSED_DATA_DIR / f"{dataset_type}_processed.pkl"
-    if pickle_file.exists():
-        try:
-            data = pd.read_pickle(pickle_file)
-            logger.info(f"Loaded data from {pickle_file}")
-            return data
-        except Exception as e:
-            logger.warning(f"Error loading pickle file: {e}")
-    
-    # Fall back to CSV if pickle fails
-    csv_file = PROCESSED_DATA_DIR / f"{dataset_type}_processed.csv"
-    if csv_file.exists():
-        try:
-            data = pd.read_csv(csv_file)
-            logger.info(f"Loaded data from {csv_file}")
-            return data
-        except Exception as e:
-            logger.error(f"Error loading CSV file: {e}")
-            sys.exit(1)
-    
-    logger.error(f"No processed data found at {PROCESSED_DATA_DIR}")
-    logger.info("Please run the preprocess.py script first.")
-    sys.exit(1)
+    parquet_file = PROCESSED_DATA_DIR / f"{dataset_type}_processed.parquet"
+    if not parquet_file.exists():
+        logger.error(f"No processed data found at {PROCESSED_DATA_DIR}")
+        logger.info("Please run the preprocess.py script first.")
+        sys.exit(1)
+    
+    try:
+        data = pd.read_parquet(parquet_file, engine="pyarrow", columns=columns)
+        logger.info(f"Loaded data from {parquet_file}")
+        return data
+    except Exception as e:
+        logger.error(f"Error loading Parquet file: {e}")
+        sys.exit(1)
 
 def prepare_data_for_anomaly_detection(data):
-    """Prepare the data for anomaly detection."""
+    """
+    Prepare the data for anomaly detection.
+    
+    Returns the numeric features as a C-contiguous float32 array, which every
+    detector uses as is (sklearn does not have to validate and copy a
+    DataFrame for each model), and the labels as an array (or None).
+    """
     logger.info("Preparing data for anomaly detection...")
     
     # Get column names for Id and Response
     id_col = "Id" if "Id" in data.columns else data.columns[0]
     response_col = "Response" if "Response" in data.columns else None
     
-    # Create X (features) and y (label if available)
-    if response_col:
-        X = data.drop([id_col, response_col], axis=1)
-        y = data[response_col]
-    else:
-        X = data.drop([id_col], axis=1)
-        y = None
-    
     # Get only numeric features for now
-    numeric_cols = X.select_dtypes(include=np.number).columns
-    X_numeric = X[numeric_cols]
-    
-    logger.info(f"Prepared data shape: {X_numeric.shape}")
-    return X_numeric, y
+    numeric_cols = [
+        col for col in data.select_dtypes(include=np.number).columns
+        if col not in (id_col, response_col)
+    ]
+    X = np.ascontiguousarray(data[numeric_cols].to_numpy(dtype=np.float32))
+    y = data[response_col].to_numpy() if response_col else None
+    
+    logger.info(f"Prepared data shape: {X.shape}")
+    return X, y
 
-def detect_anomalies_isolation_forest(X, contamination=0.01, random_state=42):
+def detect_anomalies_isolation_forest(X, contamination=0.01, random_state=42, n_jobs=-1):
     """Detect anomalies using Isolation Forest."""
     logger.info("Detecting anomalies using Isolation Forest...")
     
@@ -118,62 +130,91 @@ def detect_anomalies_isolation_forest(X, contamination=0.01, random_state=42):
         contamination=contamination,
         random_state=random_state,
         n_estimators=100,
-        n_jobs=-1
+        n_jobs=n_jobs
     )
     
-    # Fit and predict
-    # -1 for outliers and 1 for inliers
-    y_pred = model.fit_predict(X)
-    
-    # Convert to binary labels (1 for anomalies, 0 for normal)
-    # Note: Isolation Forest returns -1 for anomalies, 1 for normal
-    anomalies = np.where(y_pred == -1, 1, 0)
+    # Fit the model
+    model.fit(X)
     
     # Get anomaly scores
     scores = -model.score_samples(X)  # Negating to have high score = more anomalous
     
+    # Convert to binary labels (1 for anomalies, 0 for normal)
+    # Note: this is what predict() returns (as -1 for anomalies), derived from
+    # the scores instead of running the samples through the trees again
+    anomalies = np.where(-scores < model.offset_, 1, 0)
+    
     logger.info(f"Identified {sum(anomalies)} anomalies out of {len(X)} samples")
     
     return model, anomalies, scores
 
-def detect_anomalies_lof(X, contamination=0.01):
-    """Detect anomalies using Local Outlier Factor."""
+def detect_anomalies_lof(X, contamination=0.01, n_neighbors=20, random_state=42, n_jobs=-1):
+    """
+    Detect anomalies using Local Outlier Factor.
+    
+    The k-nearest-neighbour graph is built once, approximately with pynndescent
+    when it is installed (exactly with NearestNeighbors otherwise), and the LOF
+    scores are computed from it with vectorized NumPy operations.
+    """
     logger.info("Detecting anomalies using Local Outlier Factor...")
     
-    # Train the model
-    model = LocalOutlierFactor(
-        n_neighbors=20,
-        contamination=contamination,
-        n_jobs=-1
-    )
-    
-    # Fit and predict
-    y_pred = model.fit_predict(X)
+    # Find the nearest neighbours of every sample (excluding the sample itself)
+    if NNDescent is not None:
+        model = NNDescent(
+            X,
+            n_neighbors=n_neighbors + 1,
+            metric="euclidean",
+            random_state=random_state,
+            n_jobs=n_jobs
+        )
+        nn_idx, nn_dist = model.neighbor_graph
+        nn_idx, nn_dist = nn_idx[:, 1:], nn_dist[:, 1:]
+    else:
+        model = NearestNeighbors(n_neighbors=n_neighbors, n_jobs=n_jobs).fit(X)
+        nn_dist, nn_idx = model.kneighbors()
     
-    # Convert to binary labels (1 for anomalies, 0 for normal)
-    # Note: LOF returns -1 for anomalies, 1 for normal
-    anomalies = np.where(y_pred == -1, 1, 0)
+    # Local reachability density and outlier factor of every sample
+    k_distance = nn_dist[:, -1]
+    reach_dist = np.maximum(nn_dist, k_distance[nn_idx])
+    lrd = 1.0 / (reach_dist.mean(axis=1) + 1e-10)
+    scores = lrd[nn_idx].mean(axis=1) / lrd
     
-    # Get anomaly scores (negative of _decision_function)
-    scores = -model.negative_outlier_factor_
+    # Flag the contamination fraction with the highest outlier factor
+    # (1 for anomalies, 0 for normal)
+    threshold = np.percentile(scores, 100 * (1 - contamination))
+    anomalies = np.where(scores > threshold, 1, 0)
     
     logger.info(f"Identified {sum(anomalies)} anomalies out of {len(X)} samples")
     
     return model, anomalies, scores
 
-def detect_anomalies_ocsvm(X, contamination=0.01):
-    """Detect anomalies using One-Class SVM."""
+def detect_anomalies_ocsvm(X, contamination=0.01, random_state=42):
+    """
+    Detect anomalies using One-Class SVM.
+    
+    The RBF kernel is approximated with Nystroem features and a linear
+    One-Class SVM is trained on them with SGD, so training scales linearly
+    with the number of samples (unlike the exact kernel OneClassSVM).
+    """
     logger.info("Detecting anomalies using One-Class SVM...")
     
     # Train the model
-    model = OneClassSVM(
-        nu=contamination,
-        kernel="rbf",
-        gamma="auto"
+    # (gamma=1/n_features is OneClassSVM's gamma="auto")
+    model = make_pipeline(
+        Nystroem(
+            kernel="rbf",
+            gamma=1.0 / X.shape[1],
+            n_components=min(200, len(X)),
+            random_state=random_state
+        ),
+        SGDOneClassSVM(
+            nu=contamination,
+            random_state=random_state
+        )
     )
     
     # Fit and predict
-    y_pred = model.fit_predict(X)
+    y_pred = model.fit(X).predict(X)
     
     # Convert to binary labels (1 for anomalies, 0 for normal)
     # Note: OneClassSVM returns -1 for anomalies, 1 for normal
@@ -219,10 +260,7 @@ def evaluate_anomaly_detection(y_true, anomalies, scores, method_name):
     logger.info(f"Evaluating {method_name} results...")
     
     # Confusion matrix
-    cm = confusion_matrix(y_true, anomalies)
-    
-    # Classification report
-    report = classification_report(y_true, anomalies, output_dict=True)
+    cm = confusion_matrix(y_true, anomalies, labels=[0, 1])
     
     # Summarize results
     tn, fp, fn, tp = cm.ravel()
@@ -231,9 +269,10 @@ def evaluate_anomaly_detection(y_true, anomalies, scores, method_name):
     logger.info(f"True Negatives: {tn}")
     logger.info(f"False Negatives: {fn}")
     
-    precision = report['1']['precision'] if '1' in report else 0
-    recall = report['1']['recall'] if '1' in report else 0
-    f1 = report['1']['f1-score'] if '1' in report else 0
+    # Precision, recall and F1-score of the anomaly class, from the confusion matrix
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
     
     logger.info(f"Precision: {precision:.4f}")
     logger.info(f"Recall: {recall:.4f}")
@@ -241,24 +280,45 @@ def evaluate_anomaly_detection(y_true, anomalies, scores, method_name):
     
     return {
         'confusion_matrix': cm,
-        'report': report,
-        'precision': precision,
-        'recall': recall,
-        'f1': f1
+        'precision': float(precision),
+        'recall': float(recall),
+        'f1': float(f1)
     }
 
-def visualize_anomalies(X, anomalies, scores, method_name):
-    """Visualize the anomalies using PCA."""
+def compute_pca_projection(X, random_state=42):
+    """
+    Project the data onto its first two principal components for plotting.
+    
+    The projection is fitted on at most PLOT_SAMPLE_SIZE rows with the
+    randomized solver (only two components are needed) and applied to all rows.
+    """
+    logger.info("Computing PCA projection for visualization...")
+    
+    if len(X) > PLOT_SAMPLE_SIZE:
+        rng = np.random.default_rng(random_state)
+        X_fit = X[rng.choice(len(X), PLOT_SAMPLE_SIZE, replace=False)]
+    else:
+        X_fit = X
+    
+    pca = PCA(n_components=2, svd_solver="randomized", iterated_power=2, random_state=random_state)
+    pca.fit(X_fit)
+    return pca.transform(X)
+
+def visualize_anomalies(X_pca, anomalies, scores, method_name):
+    """Visualize the anomalies on the PCA projection from compute_pca_projection."""
     logger.info(f"Visualizing anomalies detected by {method_name}...")
     
-    # Apply PCA for dimensionality reduction
-    pca = PCA(n_components=2)
-    X_pca = pca.fit_transform(X)
+    # Only a sample of the points is needed for the scatter plot
+    anomalies = np.asarray(anomalies)
+    if len(X_pca) > PLOT_SAMPLE_SIZE:
+        rng = np.random.default_rng(42)
+        plot_indices = rng.choice(len(X_pca), PLOT_SAMPLE_SIZE, replace=False)
+    else:
+        plot_indices = np.arange(len(X_pca))
     
     # Create a DataFrame for plotting
-    df_pca = pd.DataFrame(X_pca, columns=['PC1', 'PC2'])
-    df_pca['anomaly'] = anomalies
-    df_pca['score'] = scores
+    df_pca = pd.DataFrame(X_pca[plot_indices], columns=['PC1', 'PC2'])
+    df_pca['anomaly'] = anomalies[plot_indices]
     
     # Create the plot
     plt.figure(figsize=(12, 10))
@@ -271,14 +331,15 @@ def visualize_anomalies(X, anomalies, scores, method_name):
         hue='anomaly',
         style='anomaly',
         palette={0: 'blue', 1: 'red'},
-        data=df_pca
+        data=df_pca,
+        rasterized=True
     )
     plt.title(f'Anomalies detected by {method_name} (PCA visualization)')
     plt.legend(title='Anomaly', labels=['Normal', 'Anomaly'])
     
     # Score distribution
     plt.subplot(2, 1, 2)
-    sns.histplot(df_pca['score'], bins=50, kde=True)
+    sns.histplot(scores, bins=50, kde=True)
     plt.axvline(x=np.percentile(scores, 99), color='r', linestyle='--')
     plt.title(f'Distribution of Anomaly Scores ({method_name})')
     plt.xlabel('Anomaly Score')
@@ -288,7 +349,7 @@ def visualize_anomalies(X, anomalies, scores, method_name):
     
     # Save the plot
     output_file = PLOTS_DIR / f"anomalies_{method_name.lower().replace(' ', '_')}.png"
-    plt.savefig(output_file)
+    plt.savefig(output_file, dpi=100, bbox_inches='tight')
     logger.info(f"Plot saved to {output_file}")
     
     # Close the plot
@@ -332,12 +393,11 @@ def predict_anomaly(model, X, method_name="Isolation Forest"):
     try:
         # Different models have different prediction methods/attributes
         if method_name.lower() == "isolation forest":
-            # Prediction: -1 for anomalies, 1 for normal
-            y_pred = model.predict(X)
-            # Convert to binary format (1 for anomaly, 0 for normal)
-            anomalies = np.where(y_pred == -1, 1, 0)
             # Get anomaly scores
             scores = -model.score_samples(X)
+            # Binary format (1 for anomaly, 0 for normal), as predict() would
+            # give but without scoring the samples twice
+            anomalies = np.where(-scores < model.offset_, 1, 0)
             
         elif method_name.lower() == "one-class svm":
             # Prediction: -1 for anomalies, 1 for normal
@@ -376,34 +436,37 @@ def save_results(anomalies, scores, evaluation, method_name):
     """Save the anomaly detection results."""
     logger.info(f"Saving {method_name} results...")
     
-    # Create results DataFrame
-    results_df = pd.DataFrame({
-        'anomaly': anomalies,
-        'score': scores
+    # Save results as Parquet (int8 labels and float32 scores)
+    results_table = pa.table({
+        'anomaly': np.asarray(anomalies, dtype=np.int8),
+        'score': np.asarray(scores, dtype=np.float32)
     })
-    
-    # Save results
-    results_file = RESULTS_DIR / f"anomaly_results_{method_name.lower().replace(' ', '_')}.csv"
-    results_df.to_csv(results_file, index=False)
+    results_file = RESULTS_DIR / f"anomaly_results_{method_name.lower().replace(' ', '_')}.parquet"
+    pq.write_table(results_table, results_file, compression='zstd')
     logger.info(f"Results saved to {results_file}")
     
     # Save evaluation metrics if available
     if evaluation:
         metrics_file = RESULTS_DIR / f"anomaly_metrics_{method_name.lower().replace(' ', '_')}.json"
         
-        # Convert numpy arrays to lists for JSON serialization
-        serializable_eval = {}
-        for key, value in evaluation.items():
-            if isinstance(value, np.ndarray):
-                serializable_eval[key] = value.tolist()
-            else:
-                serializable_eval[key] = value
-        
-        import json
-        with open(metrics_file, 'w') as f:
-            json.dump(serializable_eval, f, indent=4)
+        # orjson serializes the numpy arrays (confusion matrix) natively
+        metrics_file.write_bytes(
+            orjson.dumps(evaluation, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2)
+        )
         logger.info(f"Evaluation metrics saved to {metrics_file}")
 
+def run_method(method_name, detect_fn, X, X_pca, y, contamination, save_trained_model=True, **kwargs):
+    """Detect, evaluate, visualize and save the anomalies found by one method."""
+    configure_logging()
+    
+    model, anomalies, scores = detect_fn(X, contamination, **kwargs)
+    evaluation = evaluate_anomaly_detection(y, anomalies, scores, method_name)
+    visualize_anomalies(X_pca, anomalies, scores, method_name)
+    if save_trained_model:
+        save_model(model, method_name)
+    save_results(anomalies, scores, evaluation, method_name)
+    return method_name, anomalies, scores, evaluation
+
 def main():
     """Main function to detect anomalies in the Bosch dataset."""
     logger.info("Starting anomaly detection...")
@@ -415,58 +478,48 @@ def main():
     # Prepare data
     X, y = prepare_data_for_anomaly_detection(data)
     
+    # The same 2-D projection is used to plot the results of every method
+    X_pca = compute_pca_projection(X)
+    
     # Define contamination rate (proportion of anomalies expected)
     # This should be tuned based on domain knowledge or through validation
     contamination = 0.01  # Example: 1% anomalies
     
-    # Method 1: Isolation Forest
-    method_name = "Isolation Forest"
-    model, anomalies, scores = detect_anomalies_isolation_forest(X, contamination)
-    evaluation = evaluate_anomaly_detection(y, anomalies, scores, method_name)
-    visualize_anomalies(X, anomalies, scores, method_name)
-    save_model(model, method_name)
-    save_results(anomalies, scores, evaluation, method_name)
-    
-    # Method 2: Local Outlier Factor
-    method_name = "Local Outlier Factor"
-    model, anomalies, scores = detect_anomalies_lof(X, contamination)
-    evaluation = evaluate_anomaly_detection(y, anomalies, scores, method_name)
-    visualize_anomalies(X, anomalies, scores, method_name)
+    # Methods to run: (name, detection function, whether the detector takes
+    # n_jobs, whether to save the trained model)
     # Note: LOF model doesn't support predict() on new data in sklearn
     # so we don't save it
-    save_results(anomalies, scores, evaluation, method_name)
+    methods = [
+        ("Isolation Forest", detect_anomalies_isolation_forest, True, True),
+        ("Local Outlier Factor", detect_anomalies_lof, True, False),
+        ("One-Class SVM", detect_anomalies_ocsvm, False, True),
+    ]
     
-    # Method 3: One-Class SVM (using a sample if data is large)
-    # One-Class SVM can be computationally expensive for large datasets
-    if len(X) > 10000:
-        logger.info("Dataset is large, sampling for One-Class SVM...")
-        sample_size = min(10000, len(X))
-        sample_indices = np.random.choice(len(X), sample_size, replace=False)
-        X_sample = X.iloc[sample_indices]
-        y_sample = y.iloc[sample_indices] if y is not None else None
-    else:
-        X_sample = X
-        y_sample = y
-    
-    method_name = "One-Class SVM"
-    model, anomalies, scores = detect_anomalies_ocsvm(X_sample, contamination)
-    evaluation = evaluate_anomaly_detection(y_sample, anomalies, scores, method_name)
-    visualize_anomalies(X_sample, anomalies, scores, method_name)
-    save_model(model, method_name)
-    save_results(anomalies, scores, evaluation, method_name)
-    
-    # Method 4: Elliptic Envelope (only if data is not too high-dimensional)
+    # Elliptic Envelope (only if data is not too high-dimensional)
     # Elliptic Envelope works poorly in high dimensions
     if X.shape[1] <= 20:
-        method_name = "Elliptic Envelope"
-        model, anomalies, scores = detect_anomalies_elliptic_envelope(X, contamination)
-        evaluation = evaluate_anomaly_detection(y, anomalies, scores, method_name)
-        visualize_anomalies(X, anomalies, scores, method_name)
-        save_model(model, method_name)
-        save_results(anomalies, scores, evaluation, method_name)
+        methods.append(("Elliptic Envelope", detect_anomalies_elliptic_envelope, False, True))
     else:
         logger.info(f"Skipping Elliptic Envelope: data is too high-dimensional ({X.shape[1]} features)")
     
+    # Run the methods in parallel worker processes (joblib memory-maps X and
+    # X_pca into the workers); the CPUs are split between the workers so that
+    # the multi-threaded detectors don't oversubscribe them
+    n_jobs = max(1, (os.cpu_count() or 1) // len(methods))
+    Parallel(n_jobs=len(methods), backend="loky")(
+        delayed(run_method)(
+            method_name,
+            detect_fn,
+            X,
+            X_pca,
+            y,
+            contamination,
+            save_trained_model,
+            **({"n_jobs": n_jobs} if takes_n_jobs else {})
+        )
+        for method_name, detect_fn, takes_n_jobs, save_trained_model in methods
+    )
+    
     logger.info("Anomaly detection completed successfully.")
 
 if __name__ == "__main__":
@@ -0,0 +1,2 @@
+# analysis.src.web package
+# This file makes the web directory a Python package
\ No newline at end of file
@@ -12,13 +12,24 @@ This application provides:
 
 import os
 import sys
+import argparse
+import shutil
 import logging
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-import json
-import pandas as pd
+import orjson
 import numpy as np
-from flask import Flask, render_template, jsonify, request, send_from_directory
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from flask import Flask, Response, abort, render_template, request, send_from_directory
 from flask_cors import CORS
+from flask_compress import Compress
+from werkzeug.security import safe_join
+from json_provider import JSON_OPTIONS, OrjsonProvider
 
 # Configure logging
 logging.basicConfig(
@@ -39,14 +50,37 @@ PLOTS_DIR = RESULTS_DIR / "plots"
 STATIC_DIR = CURRENT_DIR / "static"
 TEMPLATES_DIR = CURRENT_DIR / "templates"
 
+# Anomaly detection methods whose results are served, with their display names
+ANOMALY_METHODS = ["isolation_forest", "local_outlier_factor", "one-class_svm", "elliptic_envelope"]
+METHOD_NAMES = {method: method.replace('_', ' ').title() for method in ANOMALY_METHODS}
+
 # Initialize Flask app
 app = Flask(
     __name__,
     static_folder=str(STATIC_DIR),
     template_folder=str(TEMPLATES_DIR)
 )
+app.json = OrjsonProvider(app)
 CORS(app)
 
+# Compress the JSON API responses (and the dashboard's HTML/CSS/JS), preferring
+# Brotli; tiny responses aren't worth compressing
+app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+app.config["COMPRESS_MIN_SIZE"] = 256
+Compress(app)
+
+def scan_plots():
+    """
+    List the PNG files in PLOTS_DIR as os.DirEntry objects.
+    
+    os.scandir gets the file types from the directory listing itself, so
+    the files don't have to be stat-ed one by one.
+    """
+    if not PLOTS_DIR.is_dir():
+        return []
+    with os.scandir(PLOTS_DIR) as entries:
+        return [entry for entry in entries if entry.name.endswith(".png") and entry.is_file()]
+
 # Ensure directories exist
 def ensure_dirs_exist():
     """Create necessary directories if they don't exist."""
@@ -54,59 +88,155 @@ def ensure_dirs_exist():
     TEMPLATES_DIR.mkdir(parents=True, exist_ok=True)
     
     # Create symbolic link to plots directory in static
+    # (replacing a link that points to a directory which no longer exists)
     plots_link = STATIC_DIR / "plots"
-    if not plots_link.exists():
+    if plots_link.is_symlink() and not plots_link.exists():
+        plots_link.unlink(missing_ok=True)
+    # Nothing to do if the link (or the fallback directory) is already there
+    if not os.path.lexists(plots_link):
         try:
             os.symlink(PLOTS_DIR, plots_link, target_is_directory=True)
-        except Exception as e:
+        except FileExistsError:
+            # Another process created it in the meantime
+            pass
+        except OSError as e:
             logger.warning(f"Could not create symbolic link: {e}")
-            # If symlink fails, copy plot files
+            # If symlink fails, hard link the plot files (no data is copied),
+            # copying them only if that fails too (e.g. across file systems).
+            # Files that are already there are skipped
             plots_link.mkdir(exist_ok=True)
-            for plot_file in PLOTS_DIR.glob("*.png"):
-                os.system(f"cp {plot_file} {plots_link}/{plot_file.name}")
+            for plot_file in scan_plots():
+                target = plots_link / plot_file.name
+                try:
+                    os.link(plot_file.path, target)
+                except FileExistsError:
+                    continue
+                except OSError:
+                    shutil.copyfile(plot_file.path, target)
+
+def train_data_mtime():
+    """Modification time of the processed training data, or None if there is none."""
+    for train_file in (PROCESSED_DATA_DIR / "train_processed.parquet", PROCESSED_DATA_DIR / "train_processed.pkl"):
+        try:
+            return train_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            continue
+    return None
 
 # Load data and results
-def load_data_and_results():
-    """Load processed data and anomaly detection results."""
+@lru_cache(maxsize=1)
+def load_data_and_results(train_mtime=None):
+    """
+    Load the processed data.
+    
+    The data is cached keyed on train_mtime; get_data passes the current
+    mtime, so the data is reloaded when the training data file changes.
+    pandas is only imported when it is needed (pyarrow imports it itself for
+    to_pandas), which keeps the app, and each gunicorn worker, fast to start.
+    
+    No route uses the training data, so it is only loaded when the
+    PL_LOAD_TRAIN=1 environment variable is set. Anomaly detection results
+    are loaded on demand by load_method_results.
+    """
     data = {}
     
-    # Load processed data
+    if os.environ.get("PL_LOAD_TRAIN") != "1":
+        logger.info("Not loading the training data (set PL_LOAD_TRAIN=1 to load it)")
+        return data
+    
+    # Load processed data (the Parquet file written by preprocess.py, or the
+    # pickle file from older preprocessing runs)
     try:
-        train_file = PROCESSED_DATA_DIR / "train_processed.pkl"
+        train_file = PROCESSED_DATA_DIR / "train_processed.parquet"
+        legacy_train_file = PROCESSED_DATA_DIR / "train_processed.pkl"
         if train_file.exists():
-            data["train"] = pd.read_pickle(train_file)
+            # Memory-map the file and free the Arrow buffers as they are
+            # handed over to pandas
+            table = pq.read_table(train_file, memory_map=True)
+            data["train"] = table.to_pandas(split_blocks=True, self_destruct=True)
+            del table
+            logger.info(f"Loaded training data: {data['train'].shape}")
+        elif legacy_train_file.exists():
+            import pandas as pd
+            data["train"] = pd.read_pickle(legacy_train_file)
             logger.info(f"Loaded training data: {data['train'].shape}")
         else:
             logger.warning("Training data not found.")
     except Exception as e:
         logger.error(f"Error loading training data: {e}")
     
-    # Load anomaly detection results
-    methods = ["isolation_forest", "local_outlier_factor", "one-class_svm", "elliptic_envelope"]
-    data["anomaly_results"] = {}
+    return data
+
+def get_data():
+    """The processed data, reloaded if the training data file has changed."""
+    return load_data_and_results(train_data_mtime())
+
+def read_legacy_results(csv_file, parquet_file):
+    """
+    Read the anomaly results CSV of an older anomaly.py run.
+    
+    The results are also saved as Parquet for the next start; if that fails
+    the results read from the CSV are still used.
+    """
+    logger.info(f"Converting {csv_file} to Parquet...")
+    # pyarrow parses the file with multiple threads straight into typed columns
+    results = pacsv.read_csv(
+        csv_file,
+        convert_options=pacsv.ConvertOptions(column_types={"anomaly": pa.int8(), "score": pa.float32()})
+    )
+    try:
+        pq.write_table(results, parquet_file, compression="zstd")
+    except OSError as e:
+        logger.warning(f"Could not save {csv_file} as Parquet: {e}")
+    return results
+
+def scan_results():
+    """Names of the files in RESULTS_DIR, from a single directory listing."""
+    if not RESULTS_DIR.is_dir():
+        return frozenset()
+    with os.scandir(RESULTS_DIR) as entries:
+        return frozenset(entry.name for entry in entries)
+
+# Load anomaly detection results
+@lru_cache(maxsize=8)
+def load_method_results(method, result_files):
+    """
+    Load the anomaly detection results of one method on first use.
     
-    for method in methods:
-        results_file = RESULTS_DIR / f"anomaly_results_{method}.csv"
-        metrics_file = RESULTS_DIR / f"anomaly_metrics_{method}.json"
-        
-        if results_file.exists():
-            try:
-                results = pd.read_csv(results_file)
-                data["anomaly_results"][method] = {
-                    "results": results,
-                    "metrics": None
-                }
-                
-                if metrics_file.exists():
-                    with open(metrics_file, 'r') as f:
-                        metrics = json.load(f)
-                    data["anomaly_results"][method]["metrics"] = metrics
-                
-                logger.info(f"Loaded anomaly results for {method}")
-            except Exception as e:
-                logger.error(f"Error loading anomaly results for {method}: {e}")
+    result_files are the file names in RESULTS_DIR (from scan_results), so
+    no file has to be checked for separately. Only the anomaly labels are
+    read, as that is all the API needs, and they are kept bit-packed (one
+    bit per sample). Returns None if the method has no results.
+    """
+    results_name = f"anomaly_results_{method}.parquet"
+    legacy_results_name = f"anomaly_results_{method}.csv"
+    metrics_name = f"anomaly_metrics_{method}.json"
+    results_file = RESULTS_DIR / results_name
+    metrics_file = RESULTS_DIR / metrics_name
     
-    return data
+    try:
+        if results_name in result_files:
+            results = pq.read_table(results_file, columns=["anomaly"])
+        elif legacy_results_name in result_files:
+            results = read_legacy_results(RESULTS_DIR / legacy_results_name, results_file)
+        else:
+            return None
+        
+        anomalies = results.column("anomaly").to_numpy()
+        method_results = {
+            "packed_anomalies": np.packbits(anomalies != 0),
+            "total_samples": anomalies.size,
+            "metrics": None
+        }
+        
+        if metrics_name in result_files:
+            method_results["metrics"] = orjson.loads(metrics_file.read_bytes())
+        
+        logger.info(f"Loaded anomaly results for {method}")
+        return method_results
+    except Exception as e:
+        logger.error(f"Error loading anomaly results for {method}: {e}")
+        return None
 
 # Define routes
 @app.route('/')
@@ -124,24 +254,37 @@ def anomalies():
     """Anomaly detection results page."""
     return render_template('anomalies.html')
 
-@app.route('/api/anomaly-summary')
-def anomaly_summary():
-    """API endpoint for anomaly detection summary."""
+@lru_cache(maxsize=1)
+def build_anomaly_summary():
+    """
+    Build the anomaly detection summary as JSON bytes and their ETag.
+    
+    The results don't change while the app runs, so this is computed once.
+    """
     summary = {}
     
-    for method, results_data in app.config['data']['anomaly_results'].items():
-        if results_data['results'] is not None:
-            results = results_data['results']
+    # List the results directory once and read the methods' files in parallel
+    # (pyarrow releases the GIL while reading)
+    result_files = scan_results()
+    with ThreadPoolExecutor(max_workers=len(ANOMALY_METHODS)) as executor:
+        method_results = list(executor.map(
+            load_method_results, ANOMALY_METHODS, repeat(result_files)
+        ))
+    
+    for method, results_data in zip(ANOMALY_METHODS, method_results):
+        if results_data is not None:
+            packed_anomalies = results_data['packed_anomalies']
+            total_samples = results_data['total_samples']
             metrics = results_data['metrics']
             
-            method_name = method.replace('_', ' ').title()
-            anomaly_count = results['anomaly'].sum()
-            total_samples = len(results)
+            # The labels are packed to one bit per sample, so the count is a
+            # popcount over the packed bytes (the padding bits are zero)
+            anomaly_count = int.from_bytes(packed_anomalies.tobytes(), "little").bit_count()
             anomaly_percentage = (anomaly_count / total_samples) * 100
             
             summary[method] = {
-                'method': method_name,
-                'anomaly_count': int(anomaly_count),
+                'method': METHOD_NAMES[method],
+                'anomaly_count': anomaly_count,
                 'total_samples': total_samples,
                 'anomaly_percentage': round(anomaly_percentage, 2)
             }
@@ -158,480 +301,166 @@ def anomaly_summary():
                     'f1': f1
                 })
     
-    return jsonify(summary)
+    payload = orjson.dumps(summary, option=JSON_OPTIONS)
+    return payload, hashlib.md5(payload).hexdigest()
 
-@app.route('/api/plots')
-def list_plots():
-    """API endpoint to list available plots."""
-    plots = []
+def etag_matches(etag):
+    """
+    Check the request's If-None-Match header against an ETag.
     
-    for plot_file in PLOTS_DIR.glob("*.png"):
-        plots.append({
-            'name': plot_file.stem,
-            'url': f"/static/plots/{plot_file.name}"
-        })
-    
-    return jsonify(plots)
+    flask-compress appends the encoding to the ETag of compressed responses
+    (e.g. "<md5>:br"), so that suffix is ignored when comparing.
+    """
+    if request.if_none_match.star_tag:
+        return True
+    return any(
+        tag.split(":", 1)[0] == etag
+        for tag in request.if_none_match.as_set(include_weak=True)
+    )
 
-# Main function to run the app
-def main():
-    """Main function to run the Flask app."""
-    logger.info("Starting Flask application...")
-    ensure_dirs_exist()
-    
-    # Load data and results
-    app.config['data'] = load_data_and_results()
-    
-    # Check if template files exist, copy example templates if not
-    index_template = TEMPLATES_DIR / "index.html"
-    dashboard_template = TEMPLATES_DIR / "dashboard.html"
-    anomalies_template = TEMPLATES_DIR / "anomalies.html"
+@app.route('/api/anomaly-summary')
+def anomaly_summary():
+    """API endpoint for anomaly detection summary."""
+    payload, etag = build_anomaly_summary()
     
-    # Create example templates if they don't exist
-    # We would normally have these files in the repository
-    # but we'll generate them here for this example
-    if not index_template.exists():
-        with open(index_template, 'w') as f:
-            f.write("""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Production Line Analysis</title>
-    <link rel="stylesheet" href="https://stackpath.bootstrapcdn.com/bootstrap/4.5.2/css/bootstrap.min.css">
-    <link rel="stylesheet" href="{{ url_for('static', filename='css/style.css') }}">
-</head>
-<body>
-    <nav class="navbar navbar-expand-lg navbar-dark bg-dark">
-        <a class="navbar-brand" href="/">Production Line Analysis</a>
-        <button class="navbar-toggler" type="button" data-toggle="collapse" data-target="#navbarNav">
-            <span class="navbar-toggler-icon"></span>
-        </button>
-        <div class="collapse navbar-collapse" id="navbarNav">
-            <ul class="navbar-nav">
-                <li class="nav-item active">
-                    <a class="nav-link" href="/">Home</a>
-                </li>
-                <li class="nav-item">
-                    <a class="nav-link" href="/dashboard">Dashboard</a>
-                </li>
-                <li class="nav-item">
-                    <a class="nav-link" href="/anomalies">Anomalies</a>
-                </li>
-            </ul>
-        </div>
-    </nav>
-
-    <div class="container mt-4">
-        <div class="jumbotron">
-            <h1>Production Line Performance Analysis</h1>
-            <p class="lead">Analysis of Bosch production line data</p>
-            <hr class="my-4">
-            <p>This application presents analysis results from the Bosch Production Line Performance dataset.</p>
-            <a class="btn btn-primary btn-lg" href="/dashboard" role="button">View Dashboard</a>
-        </div>
-    </div>
+    # Repeated polls by the dashboard get an empty 304 response
+    if etag_matches(etag):
+        response = Response(status=304)
+    else:
+        response = Response(payload, mimetype='application/json')
+    response.set_etag(etag)
+    return response
 
-    <script src="https://code.jquery.com/jquery-3.5.1.min.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/popper.js@1.16.1/dist/umd/popper.min.js"></script>
-    <script src="https://stackpath.bootstrapcdn.com/bootstrap/4.5.2/js/bootstrap.min.js"></script>
-    <script src="{{ url_for('static', filename='js/main.js') }}"></script>
-</body>
-</html>
-            """)
+@lru_cache(maxsize=1)
+def find_plot_entries(plots_mtime):
+    """
+    Serialized JSON entries of the plots in PLOTS_DIR.
     
-    if not dashboard_template.exists():
-        with open(dashboard_template, 'w') as f:
-            f.write("""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Dashboard - Production Line Analysis</title>
-    <link rel="stylesheet" href="https://stackpath.bootstrapcdn.com/bootstrap/4.5.2/css/bootstrap.min.css">
-    <link rel="stylesheet" href="{{ url_for('static', filename='css/style.css') }}">
-</head>
-<body>
-    <nav class="navbar navbar-expand-lg navbar-dark bg-dark">
-        <a class="navbar-brand" href="/">Production Line Analysis</a>
-        <button class="navbar-toggler" type="button" data-toggle="collapse" data-target="#navbarNav">
-            <span class="navbar-toggler-icon"></span>
-        </button>
-        <div class="collapse navbar-collapse" id="navbarNav">
-            <ul class="navbar-nav">
-                <li class="nav-item">
-                    <a class="nav-link" href="/">Home</a>
-                </li>
-                <li class="nav-item active">
-                    <a class="nav-link" href="/dashboard">Dashboard</a>
-                </li>
-                <li class="nav-item">
-                    <a class="nav-link" href="/anomalies">Anomalies</a>
-                </li>
-            </ul>
-        </div>
-    </nav>
-
-    <div class="container mt-4">
-        <h1>Production Line Dashboard</h1>
-        <div class="row mt-4">
-            <div class="col-md-6">
-                <div class="card">
-                    <div class="card-header">
-                        Anomaly Detection Summary
-                    </div>
-                    <div class="card-body">
-                        <div id="anomaly-summary"></div>
-                    </div>
-                </div>
-            </div>
-            <div class="col-md-6">
-                <div class="card">
-                    <div class="card-header">
-                        Production Line Metrics
-                    </div>
-                    <div class="card-body">
-                        <div id="metrics-chart"></div>
-                    </div>
-                </div>
-            </div>
-        </div>
-        <div class="row mt-4">
-            <div class="col-md-12">
-                <div class="card">
-                    <div class="card-header">
-                        Available Visualizations
-                    </div>
-                    <div class="card-body">
-                        <div class="row" id="plot-gallery"></div>
-                    </div>
-                </div>
-            </div>
-        </div>
-    </div>
+    Cached on the directory mtime, so the directory is only scanned again
+    after it has changed.
+    """
+    if plots_mtime is None:
+        return ()
+    return tuple(
+        orjson.dumps({
+            'name': os.path.splitext(plot_file.name)[0],
+            'url': f"/static/plots/{plot_file.name}"
+        })
+        for plot_file in scan_plots()
+    )
 
-    <script src="https://code.jquery.com/jquery-3.5.1.min.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/popper.js@1.16.1/dist/umd/popper.min.js"></script>
-    <script src="https://stackpath.bootstrapcdn.com/bootstrap/4.5.2/js/bootstrap.min.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <script src="{{ url_for('static', filename='js/dashboard.js') }}"></script>
-</body>
-</html>
-            """)
+@app.route('/api/plots')
+def list_plots():
+    """API endpoint to list available plots."""
+    # The directory mtime changes whenever a plot is added, removed or renamed
+    try:
+        plots_mtime = PLOTS_DIR.stat().st_mtime_ns
+    except FileNotFoundError:
+        plots_mtime = None
+    plot_entries = find_plot_entries(plots_mtime)
     
-    if not anomalies_template.exists():
-        with open(anomalies_template, 'w') as f:
-            f.write("""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Anomalies - Production Line Analysis</title>
-    <link rel="stylesheet" href="https://stackpath.bootstrapcdn.com/bootstrap/4.5.2/css/bootstrap.min.css">
-    <link rel="stylesheet" href="{{ url_for('static', filename='css/style.css') }}">
-</head>
-<body>
-    <nav class="navbar navbar-expand-lg navbar-dark bg-dark">
-        <a class="navbar-brand" href="/">Production Line Analysis</a>
-        <button class="navbar-toggler" type="button" data-toggle="collapse" data-target="#navbarNav">
-            <span class="navbar-toggler-icon"></span>
-        </button>
-        <div class="collapse navbar-collapse" id="navbarNav">
-            <ul class="navbar-nav">
-                <li class="nav-item">
-                    <a class="nav-link" href="/">Home</a>
-                </li>
-                <li class="nav-item">
-                    <a class="nav-link" href="/dashboard">Dashboard</a>
-                </li>
-                <li class="nav-item active">
-                    <a class="nav-link" href="/anomalies">Anomalies</a>
-                </li>
-            </ul>
-        </div>
-    </nav>
+    # The entries are already serialized, so they are only joined into the array
+    return Response(b'[' + b','.join(plot_entries) + b']', mimetype='application/json')
 
-    <div class="container mt-4">
-        <h1>Anomaly Detection Results</h1>
-        <div class="row mt-4">
-            <div class="col-md-12">
-                <div class="card">
-                    <div class="card-header">
-                        Anomaly Detection Methods
-                    </div>
-                    <div class="card-body">
-                        <div class="method-tabs">
-                            <ul class="nav nav-tabs" id="method-tabs" role="tablist">
-                                <li class="nav-item">
-                                    <a class="nav-link active" id="isolation-forest-tab" data-toggle="tab" href="#isolation-forest" role="tab">Isolation Forest</a>
-                                </li>
-                                <li class="nav-item">
-                                    <a class="nav-link" id="lof-tab" data-toggle="tab" href="#lof" role="tab">Local Outlier Factor</a>
-                                </li>
-                                <li class="nav-item">
-                                    <a class="nav-link" id="ocsvm-tab" data-toggle="tab" href="#ocsvm" role="tab">One-Class SVM</a>
-                                </li>
-                                <li class="nav-item">
-                                    <a class="nav-link" id="elliptic-tab" data-toggle="tab" href="#elliptic" role="tab">Elliptic Envelope</a>
-                                </li>
-                            </ul>
-                            <div class="tab-content mt-3" id="method-content">
-                                <div class="tab-pane fade show active" id="isolation-forest" role="tabpanel">
-                                    <div class="row">
-                                        <div class="col-md-6">
-                                            <h4>Isolation Forest Results</h4>
-                                            <div id="if-metrics"></div>
-                                        </div>
-                                        <div class="col-md-6">
-                                            <img src="/static/plots/anomalies_isolation_forest.png" class="img-fluid" alt="Isolation Forest Results">
-                                        </div>
-                                    </div>
-                                </div>
-                                <div class="tab-pane fade" id="lof" role="tabpanel">
-                                    <div class="row">
-                                        <div class="col-md-6">
-                                            <h4>Local Outlier Factor Results</h4>
-                                            <div id="lof-metrics"></div>
-                                        </div>
-                                        <div class="col-md-6">
-                                            <img src="/static/plots/anomalies_local_outlier_factor.png" class="img-fluid" alt="Local Outlier Factor Results">
-                                        </div>
-                                    </div>
-                                </div>
-                                <div class="tab-pane fade" id="ocsvm" role="tabpanel">
-                                    <div class="row">
-                                        <div class="col-md-6">
-                                            <h4>One-Class SVM Results</h4>
-                                            <div id="ocsvm-metrics"></div>
-                                        </div>
-                                        <div class="col-md-6">
-                                            <img src="/static/plots/anomalies_one-class_svm.png" class="img-fluid" alt="One-Class SVM Results">
-                                        </div>
-                                    </div>
-                                </div>
-                                <div class="tab-pane fade" id="elliptic" role="tabpanel">
-                                    <div class="row">
-                                        <div class="col-md-6">
-                                            <h4>Elliptic Envelope Results</h4>
-                                            <div id="elliptic-metrics"></div>
-                                        </div>
-                                        <div class="col-md-6">
-                                            <img src="/static/plots/anomalies_elliptic_envelope.png" class="img-fluid" alt="Elliptic Envelope Results">
-                                        </div>
-                                    </div>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-    </div>
+@lru_cache(maxsize=256)
+def plot_etag(path, mtime_ns, size):
+    """
+    ETag (MD5 of the contents) of a plot file.
+    
+    Cached on the file's mtime and size, so a plot is only hashed again
+    after anomaly.py has rewritten it.
+    """
+    with open(path, 'rb') as f:
+        return hashlib.md5(f.read()).hexdigest()
 
-    <script src="https://code.jquery.com/jquery-3.5.1.min.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/popper.js@1.16.1/dist/umd/popper.min.js"></script>
-    <script src="https://stackpath.bootstrapcdn.com/bootstrap/4.5.2/js/bootstrap.min.js"></script>
-    <script src="{{ url_for('static', filename='js/anomalies.js') }}"></script>
-</body>
-</html>
-            """)
+@app.route('/static/plots/<path:filename>')
+def serve_plot(filename):
+    """Serve a plot image, letting browsers revalidate their cached copy."""
+    path = safe_join(str(PLOTS_DIR), filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    stat = os.stat(path)
+    etag = plot_etag(path, stat.st_mtime_ns, stat.st_size)
     
-    # Create CSS and JavaScript files
-    css_dir = STATIC_DIR / "css"
-    js_dir = STATIC_DIR / "js"
-    css_dir.mkdir(exist_ok=True)
-    js_dir.mkdir(exist_ok=True)
+    # Unchanged plots get a 304 without the file being opened
+    if etag_matches(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+    else:
+        response = send_from_directory(PLOTS_DIR, filename, conditional=True, etag=etag)
     
-    style_css = css_dir / "style.css"
-    if not style_css.exists():
-        with open(style_css, 'w') as f:
-            f.write("""
-body {
-    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-    background-color: #f8f9fa;
-}
-
-.navbar {
-    margin-bottom: 20px;
-}
+    # anomaly.py overwrites the plots in place, so cached copies are checked
+    # against the ETag (a 304 if unchanged) rather than being treated as immutable
+    response.headers['Cache-Control'] = 'public, no-cache'
+    return response
 
-.card {
-    margin-bottom: 20px;
-    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-}
+def hash_plots():
+    """Hash the plots once up front for their ETags."""
+    for plot_file in scan_plots():
+        stat = plot_file.stat()
+        plot_etag(plot_file.path, stat.st_mtime_ns, stat.st_size)
 
-.card-header {
-    background-color: #343a40;
-    color: white;
-    font-weight: bold;
-}
-
-.jumbotron {
-    background-color: #ffffff;
-    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-}
-
-#plot-gallery img {
-    max-width: 100%;
-    height: auto;
-    margin-bottom: 15px;
-    border: 1px solid #ddd;
-    border-radius: 4px;
-    padding: 5px;
-}
+# Main function to run the app
+def parse_args():
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description="Serve the production line analysis results.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--prod", action="store_true",
+                      help="serve with gunicorn and gevent workers instead of the Flask dev server")
+    mode.add_argument("--dev", action="store_true",
+                      help="run the Flask dev server in debug mode")
+    return parser.parse_args()
 
-#plot-gallery .col-md-6 {
-    margin-bottom: 20px;
-}
+# With gunicorn --preload the app is imported once in the master process, so
+# load the data, build the summary and hash the plots there: the forked
+# workers then share these read-only objects copy-on-write instead of each
+# loading their own copy
+if os.environ.get("GUNICORN_PRELOAD") == "1":
+    get_data()
+    build_anomaly_summary()
+    hash_plots()
 
-.table-responsive {
-    margin-top: 20px;
-}
-            """)
-    
-    main_js = js_dir / "main.js"
-    if not main_js.exists():
-        with open(main_js, 'w') as f:
-            f.write("""
-// Main JavaScript file for the application
-$(document).ready(function() {
-    console.log('Production Line Analysis application loaded');
-});
-            """)
-    
-    dashboard_js = js_dir / "dashboard.js"
-    if not dashboard_js.exists():
-        with open(dashboard_js, 'w') as f:
-            f.write("""
-// Dashboard JavaScript file
-$(document).ready(function() {
-    // Load anomaly summary
-    $.getJSON('/api/anomaly-summary', function(data) {
-        let html = '<table class="table table-striped">';
-        html += '<thead><tr><th>Method</th><th>Anomalies</th><th>Samples</th><th>Percentage</th></tr></thead>';
-        html += '<tbody>';
-        
-        for (let key in data) {
-            let method = data[key];
-            html += '<tr>';
-            html += '<td>' + method.method + '</td>';
-            html += '<td>' + method.anomaly_count + '</td>';
-            html += '<td>' + method.total_samples + '</td>';
-            html += '<td>' + method.anomaly_percentage + '%</td>';
-            html += '</tr>';
-        }
-        
-        html += '</tbody></table>';
-        $('#anomaly-summary').html(html);
-    });
+def main():
+    """Main function to run the Flask app."""
+    args = parse_args()
+    logger.info("Starting Flask application...")
+    ensure_dirs_exist()
     
-    // Load available plots
-    $.getJSON('/api/plots', function(data) {
-        let html = '';
-        
-        data.forEach(function(plot) {
-            html += '<div class="col-md-6">';
-            html += '<div class="card">';
-            html += '<div class="card-header">' + plot.name.replace(/_/g, ' ').replace(/\\b\\w/g, l => l.toUpperCase()) + '</div>';
-            html += '<div class="card-body">';
-            html += '<a href="' + plot.url + '" target="_blank">';
-            html += '<img src="' + plot.url + '" class="img-fluid" alt="' + plot.name + '">';
-            html += '</a>';
-            html += '</div>';
-            html += '</div>';
-            html += '</div>';
-        });
-        
-        $('#plot-gallery').html(html);
-    });
-});
-            """)
+    # Load data and hash the plots (in production mode gunicorn preloads the
+    # app itself, see below)
+    if not args.prod:
+        get_data()
+        hash_plots()
     
-    anomalies_js = js_dir / "anomalies.js"
-    if not anomalies_js.exists():
-        with open(anomalies_js, 'w') as f:
-            f.write("""
-// Anomalies JavaScript file
-$(document).ready(function() {
-    // Load anomaly metrics for each method
-    $.getJSON('/api/anomaly-summary', function(data) {
-        // Isolation Forest
-        if (data.isolation_forest) {
-            let ifHtml = '<table class="table table-striped">';
-            ifHtml += '<tr><th>Metric</th><th>Value</th></tr>';
-            ifHtml += '<tr><td>Anomaly Count</td><td>' + data.isolation_forest.anomaly_count + '</td></tr>';
-            ifHtml += '<tr><td>Total Samples</td><td>' + data.isolation_forest.total_samples + '</td></tr>';
-            ifHtml += '<tr><td>Anomaly Percentage</td><td>' + data.isolation_forest.anomaly_percentage + '%</td></tr>';
-            
-            if (data.isolation_forest.precision !== 'N/A') {
-                ifHtml += '<tr><td>Precision</td><td>' + data.isolation_forest.precision.toFixed(4) + '</td></tr>';
-                ifHtml += '<tr><td>Recall</td><td>' + data.isolation_forest.recall.toFixed(4) + '</td></tr>';
-                ifHtml += '<tr><td>F1 Score</td><td>' + data.isolation_forest.f1.toFixed(4) + '</td></tr>';
-            }
-            
-            ifHtml += '</table>';
-            $('#if-metrics').html(ifHtml);
-        }
-        
-        // Local Outlier Factor
-        if (data.local_outlier_factor) {
-            let lofHtml = '<table class="table table-striped">';
-            lofHtml += '<tr><th>Metric</th><th>Value</th></tr>';
-            lofHtml += '<tr><td>Anomaly Count</td><td>' + data.local_outlier_factor.anomaly_count + '</td></tr>';
-            lofHtml += '<tr><td>Total Samples</td><td>' + data.local_outlier_factor.total_samples + '</td></tr>';
-            lofHtml += '<tr><td>Anomaly Percentage</td><td>' + data.local_outlier_factor.anomaly_percentage + '%</td></tr>';
-            
-            if (data.local_outlier_factor.precision !== 'N/A') {
-                lofHtml += '<tr><td>Precision</td><td>' + data.local_outlier_factor.precision.toFixed(4) + '</td></tr>';
-                lofHtml += '<tr><td>Recall</td><td>' + data.local_outlier_factor.recall.toFixed(4) + '</td></tr>';
-                lofHtml += '<tr><td>F1 Score</td><td>' + data.local_outlier_factor.f1.toFixed(4) + '</td></tr>';
-            }
-            
-            lofHtml += '</table>';
-            $('#lof-metrics').html(lofHtml);
-        }
-        
-        // One-Class SVM
-        if (data['one-class_svm']) {
-            let ocsvmHtml = '<table class="table table-striped">';
-            ocsvmHtml += '<tr><th>Metric</th><th>Value</th></tr>';
-            ocsvmHtml += '<tr><td>Anomaly Count</td><td>' + data['one-class_svm'].anomaly_count + '</td></tr>';
-            ocsvmHtml += '<tr><td>Total Samples</td><td>' + data['one-class_svm'].total_samples + '</td></tr>';
-            ocsvmHtml += '<tr><td>Anomaly Percentage</td><td>' + data['one-class_svm'].anomaly_percentage + '%</td></tr>';
-            
-            if (data['one-class_svm'].precision !== 'N/A') {
-                ocsvmHtml += '<tr><td>Precision</td><td>' + data['one-class_svm'].precision.toFixed(4) + '</td></tr>';
-                ocsvmHtml += '<tr><td>Recall</td><td>' + data['one-class_svm'].recall.toFixed(4) + '</td></tr>';
-                ocsvmHtml += '<tr><td>F1 Score</td><td>' + data['one-class_svm'].f1.toFixed(4) + '</td></tr>';
-            }
-            
-            ocsvmHtml += '</table>';
-            $('#ocsvm-metrics').html(ocsvmHtml);
-        }
-        
-        // Elliptic Envelope
-        if (data.elliptic_envelope) {
-            let ellipticHtml = '<table class="table table-striped">';
-            ellipticHtml += '<tr><th>Metric</th><th>Value</th></tr>';
-            ellipticHtml += '<tr><td>Anomaly Count</td><td>' + data.elliptic_envelope.anomaly_count + '</td></tr>';
-            ellipticHtml += '<tr><td>Total Samples</td><td>' + data.elliptic_envelope.total_samples + '</td></tr>';
-            ellipticHtml += '<tr><td>Anomaly Percentage</td><td>' + data.elliptic_envelope.anomaly_percentage + '%</td></tr>';
-            
-            if (data.elliptic_envelope.precision !== 'N/A') {
-                ellipticHtml += '<tr><td>Precision</td><td>' + data.elliptic_envelope.precision.toFixed(4) + '</td></tr>';
-                ellipticHtml += '<tr><td>Recall</td><td>' + data.elliptic_envelope.recall.toFixed(4) + '</td></tr>';
-                ellipticHtml += '<tr><td>F1 Score</td><td>' + data.elliptic_envelope.f1.toFixed(4) + '</td></tr>';
-            }
-            
-            ellipticHtml += '</table>';
-            $('#elliptic-metrics').html(ellipticHtml);
-        }
-    });
-});
-            """)
+    # The templates and static files are written once by bootstrap.py
+    if not (TEMPLATES_DIR / "index.html").exists():
+        logger.error(f"Templates not found in {TEMPLATES_DIR}")
+        logger.info("Please run the bootstrap.py script first.")
+        sys.exit(1)
     
     # Run the app
     port = 5050
     host = '0.0.0.0'
     logger.info(f"Flask app starting on http://{host}:{port}")
-    app.run(host=host, port=port, debug=True)
+    if args.prod:
+        # Replace this process with gunicorn; its gevent workers serve
+        # concurrent dashboard requests (the API endpoints are read-only).
+        # The app is preloaded so the workers share its loaded data
+        os.environ["GUNICORN_PRELOAD"] = "1"
+        try:
+            os.execvp("gunicorn", [
+                "gunicorn", "app:app",
+                "--preload",
+                "--chdir", str(CURRENT_DIR),
+                "-k", "gevent",
+                "-w", "2",
+                "-b", f"{host}:{port}"
+            ])
+        except FileNotFoundError:
+            logger.error("gunicorn is not installed. Install it with: pip install gunicorn gevent")
+            sys.exit(1)
+    else:
+        app.run(host=host, port=port, debug=args.dev)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,2 @@
+# analysis.tests package
+# This file makes the tests directory a Python package
\ No newline at end of file
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# The analysis modules are imported the way the scripts import each other
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+sys.path.insert(0, str(SRC_DIR / "web"))
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data import preprocess
+
+N_ROWS = 3000
+
+def write_raw_files(raw_dir, n_rows=N_ROWS):
+    """Write small train_*.csv files shaped like the Bosch data."""
+    rng = np.random.default_rng(0)
+    ids = np.arange(1, n_rows + 1)
+    
+    numeric = pd.DataFrame(rng.normal(size=(n_rows, 4)), columns=[f"L0_S0_F{i}" for i in range(4)])
+    numeric = numeric.mask(rng.random(numeric.shape) < 0.3)
+    numeric.insert(0, "Id", ids)
+    numeric["Response"] = rng.integers(0, 2, n_rows)
+    
+    categorical = pd.DataFrame(
+        rng.choice(["T1", "T2", None], size=(n_rows, 3)), columns=[f"L0_S1_C{i}" for i in range(3)]
+    )
+    categorical.insert(0, "Id", ids)
+    
+    date = pd.DataFrame(rng.uniform(0, 1000, size=(n_rows, 3)), columns=[f"L0_S0_D{i}" for i in range(3)])
+    date = date.mask(rng.random(date.shape) < 0.3)
+    date.insert(0, "Id", ids)
+    
+    for data_type, df in (("numeric", numeric), ("categorical", categorical), ("date", date)):
+        df.to_csv(raw_dir / f"train_{data_type}.csv", index=False)
+
+@pytest.fixture
+def data_dirs(tmp_path, monkeypatch):
+    for name in ("RAW_DATA_DIR", "INTERIM_DATA_DIR", "PROCESSED_DATA_DIR"):
+        path = tmp_path / name.lower()
+        path.mkdir()
+        monkeypatch.setattr(preprocess, name, path)
+    write_raw_files(preprocess.RAW_DATA_DIR)
+    return tmp_path
+
+@pytest.mark.parametrize("chunk_size", [700, 1000])
+def test_stream_process_caches_all_raw_files(data_dirs, chunk_size):
+    preprocess.stream_process(chunk_size=chunk_size)
+    
+    for data_type in preprocess.DATA_TYPES:
+        assert (preprocess.RAW_DATA_DIR / f"train_{data_type}.parquet").exists()
+    assert not list(preprocess.RAW_DATA_DIR.glob("*.partial"))
+    processed = pd.read_parquet(preprocess.PROCESSED_DATA_DIR / "train_processed.parquet")
+    assert len(processed) == N_ROWS
+
+def test_stream_process_reads_the_caches(data_dirs):
+    preprocess.stream_process(chunk_size=1000)
+    first = pd.read_parquet(preprocess.PROCESSED_DATA_DIR / "train_processed.parquet")
+    for data_type in preprocess.DATA_TYPES:
+        file_path = preprocess.RAW_DATA_DIR / f"train_{data_type}.csv"
+        assert preprocess.is_cache_fresh(file_path, preprocess.get_column_types(file_path, data_type))
+    
+    preprocess.stream_process(chunk_size=1000)
+    second = pd.read_parquet(preprocess.PROCESSED_DATA_DIR / "train_processed.parquet")
+    pd.testing.assert_frame_equal(first, second)
+
+def test_stream_process_rejects_misaligned_files(data_dirs):
+    date = pd.read_csv(preprocess.RAW_DATA_DIR / "train_date.csv")
+    date.iloc[:-1].to_csv(preprocess.RAW_DATA_DIR / "train_date.csv", index=False)
+    
+    with pytest.raises(ValueError):
+        preprocess.stream_process(chunk_size=1000)
+
+def test_read_csv_file_rereads_cache_with_other_types(data_dirs, monkeypatch):
+    file_path = preprocess.RAW_DATA_DIR / "train_numeric.csv"
+    df = preprocess.read_csv_file(file_path, preprocess.get_column_types(file_path, "numeric"))
+    assert df["L0_S0_F0"].dtype == np.float32
+    
+    monkeypatch.setattr(preprocess, "NUMERIC_DTYPE", np.float64)
+    column_types = preprocess.get_column_types(file_path, "numeric")
+    assert not preprocess.is_cache_fresh(file_path, column_types)
+    df = preprocess.read_csv_file(file_path, column_types)
+    assert df["L0_S0_F0"].dtype == np.float64
+    assert preprocess.is_cache_fresh(file_path, column_types)
+
+def test_read_csv_file_reads_empty_columns_as_numeric_dtype(tmp_path):
+    file_path = tmp_path / "train_numeric.csv"
+    file_path.write_text("Id,L0_S0_F0,L0_S0_F1\n1,0.5,\n2,,\n")
+    df = preprocess.read_csv_file(file_path)
+    assert df["L0_S0_F1"].dtype == preprocess.NUMERIC_DTYPE
+    assert df["L0_S0_F1"].isna().all()
@@ -0,0 +1,57 @@
+import orjson
+import pandas as pd
+import pytest
+
+import app as web_app
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # Results large enough for flask-compress to compress the summary
+    for method in web_app.ANOMALY_METHODS:
+        pd.DataFrame({"anomaly": [1, 0, 0, 1], "score": [0.1, 0.2, 0.3, 0.4]}).to_parquet(
+            tmp_path / f"anomaly_results_{method}.parquet"
+        )
+        (tmp_path / f"anomaly_metrics_{method}.json").write_bytes(
+            orjson.dumps({"precision": 0.5, "recall": 0.25, "f1": 0.3333})
+        )
+    monkeypatch.setattr(web_app, "RESULTS_DIR", tmp_path)
+    web_app.build_anomaly_summary.cache_clear()
+    web_app.load_method_results.cache_clear()
+    yield web_app.app.test_client()
+    web_app.build_anomaly_summary.cache_clear()
+    web_app.load_method_results.cache_clear()
+
+def test_anomaly_summary_not_modified_with_compressed_etag(client):
+    response = client.get("/api/anomaly-summary", headers={"Accept-Encoding": "br"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "br"
+    etag = response.headers["ETag"]
+    assert etag.endswith(':br"')
+    
+    response = client.get("/api/anomaly-summary", headers={"Accept-Encoding": "br", "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+    
+    # The handler itself answers 304, without building the full response
+    with web_app.app.test_request_context(headers={"Accept-Encoding": "br", "If-None-Match": etag}):
+        assert web_app.anomaly_summary().status_code == 304
+
+def test_etag_matches_ignores_compression_suffix():
+    with web_app.app.test_request_context(headers={"If-None-Match": '"abc:gzip", "def"'}):
+        assert web_app.etag_matches("abc")
+        assert web_app.etag_matches("def")
+        assert not web_app.etag_matches("ghi")
+
+def test_serve_plot_not_modified_with_compressed_etag(tmp_path, monkeypatch):
+    plot_file = tmp_path / "plot.png"
+    plot_file.write_bytes(b"\x89PNG" + bytes(1024))
+    monkeypatch.setattr(web_app, "PLOTS_DIR", tmp_path)
+    stat = plot_file.stat()
+    etag = web_app.plot_etag(str(plot_file), stat.st_mtime_ns, stat.st_size)
+    
+    with web_app.app.test_request_context(headers={"Accept-Encoding": "br", "If-None-Match": f'"{etag}:br"'}):
+        response = web_app.serve_plot("plot.png")
+    assert response.status_code == 304
+    
+    response = web_app.app.test_client().get("/static/plots/plot.png", headers={"If-None-Match": f'"{etag}:gzip"'})
+    assert response.status_code == 304
@@ -1,13 +1,19 @@
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory
 from flask_cors import CORS
 import numpy as np
 from sklearn.ensemble import IsolationForest
+import joblib
+from joblib import parallel_backend
 import pandas as pd
-import json
+import orjson
+import pyarrow.parquet as pq
 import os
 import sys
+import queue
+import threading
 import logging
-import pickle
+from concurrent.futures import Future
+from functools import lru_cache
 from pathlib import Path
 
 # Set up logging
@@ -25,6 +31,9 @@ ANALYSIS_DIR = ROOT_DIR / "analysis"
 ANALYSIS_SRC_DIR = ANALYSIS_DIR / "src"
 ANALYSIS_MODELS_DIR = ANALYSIS_DIR / "models"
 ANALYSIS_RESULTS_DIR = ANALYSIS_DIR / "results"
+# The basic model is saved here so it only has to be trained once
+MODELS_DIR = CURRENT_DIR / "models"
+BASIC_MODEL_FILE = MODELS_DIR / "iforest_basic.pkl"
 
 # Append analysis module to path if it exists
 if ANALYSIS_SRC_DIR.exists():
@@ -33,8 +42,9 @@ if ANALYSIS_SRC_DIR.exists():
     logger.info(f"Added analysis module to path: {ANALYSIS_SRC_DIR}")
     # Import advanced analysis functionality if available
     try:
-        from models.anomaly import load_model, predict_anomaly
-        from data.preprocess import generate_synthetic_data
+        # Only the model loading is used (the API generates its own dummy
+        # data and has its own predict_anomaly route)
+        from models.anomaly import load_model
         HAS_ADVANCED_ANALYSIS = True
         logger.info("Successfully imported advanced analysis functionality")
     except ImportError as e:
@@ -44,17 +54,100 @@ else:
     logger.warning(f"Analysis module not found at: {ANALYSIS_SRC_DIR}")
     HAS_ADVANCED_ANALYSIS = False
 
+# The JSON provider is shared with the analysis dashboard; without the
+# analysis module the API falls back to an equivalent one of its own
+try:
+    from web.json_provider import JSON_OPTIONS, OrjsonProvider
+except ImportError:
+    from flask.json.provider import JSONProvider
+    
+    # orjson options for the API responses (NumPy values are serialized natively)
+    JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    
+    class OrjsonProvider(JSONProvider):
+        """Flask JSON provider that serializes with orjson."""
+        
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, option=JSON_OPTIONS).decode()
+        
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
+# Micro-batching of the prediction requests: the most samples scored together
+PREDICT_BATCH_SIZE = 64
+
+class BatchScorer:
+    """
+    Score single samples with a model in micro-batches.
+    
+    Concurrent requests put their sample on a queue; a worker thread takes
+    up to PREDICT_BATCH_SIZE of the queued samples and scores them with one
+    decision_function call, as the trees are traversed for all the samples
+    of a batch at once. It never waits for more samples: a lone request is
+    scored right away, and the requests that arrive while a batch is being
+    scored form the next batch.
+    """
+    
+    def __init__(self, model):
+        self.model = model
+        self.requests = queue.Queue()
+        self.worker = None
+        self.lock = threading.Lock()
+    
+    def score(self, sample):
+        """Score one sample (a 1 x n_features array), blocking until it's scored."""
+        # Start the worker on first use, so that it is started in the process
+        # that serves the requests (e.g. after a server forks its workers)
+        with self.lock:
+            if self.worker is None:
+                self.worker = threading.Thread(target=self.run, daemon=True)
+                self.worker.start()
+        
+        future = Future()
+        self.requests.put((sample, future))
+        return future.result()
+    
+    def run(self):
+        """Worker loop scoring the queued samples batch by batch."""
+        while True:
+            batch = [self.requests.get()]
+            while len(batch) < PREDICT_BATCH_SIZE:
+                try:
+                    batch.append(self.requests.get_nowait())
+                except queue.Empty:
+                    break
+            
+            samples, futures = zip(*batch)
+            try:
+                # Traverse the trees on all cores with threads
+                with parallel_backend('threading', n_jobs=-1):
+                    scores = self.model.decision_function(np.vstack(samples))
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            for future, score in zip(futures, scores):
+                future.set_result(score)
+
 # Load advanced models if available
 advanced_models = {}
+advanced_scorers = {}
 if HAS_ADVANCED_ANALYSIS and ANALYSIS_MODELS_DIR.exists():
     try:
         for model_file in ANALYSIS_MODELS_DIR.glob("anomaly_detection_*.pkl"):
             model_name = model_file.stem.replace("anomaly_detection_", "")
             # Load model by method name rather than passing file path
-            advanced_models[model_name] = load_model(model_name)
+            model = load_model(model_name)
+            # Models that fail to load (load_model logs why) are not served
+            if model is None:
+                logger.warning(f"Skipping advanced model that failed to load: {model_name}")
+                continue
+            advanced_models[model_name] = model
+            advanced_scorers[model_name] = BatchScorer(model)
             logger.info(f"Loaded advanced model: {model_name}")
     except Exception as e:
         logger.error(f"Error loading advanced models: {e}")
@@ -85,15 +178,107 @@ def generate_dummy_data(n_samples=100):
     
     return data
 
-# Generate dummy data and train model for basic analysis
-data = generate_dummy_data(1000)
-model = IsolationForest(contamination=0.05, random_state=42)
-model.fit(data[['temperature', 'pressure', 'speed', 'vibration']])
+def load_or_train_basic_model(features):
+    """
+    Load the basic model saved by an earlier run, or train it and save it.
+    
+    A saved model is only used if it was trained with the same parameters.
+    """
+    model = IsolationForest(n_estimators=50, max_samples=256, contamination=0.05, n_jobs=-1, random_state=42)
+    
+    if BASIC_MODEL_FILE.exists():
+        try:
+            saved_model = joblib.load(BASIC_MODEL_FILE)
+            if saved_model.get_params() == model.get_params():
+                logger.info(f"Loaded basic model from {BASIC_MODEL_FILE}")
+                return saved_model
+            logger.info("Saved basic model has different parameters, retraining")
+        except Exception as e:
+            logger.warning(f"Could not load saved basic model: {e}")
+    
+    model.fit(features)
+    try:
+        MODELS_DIR.mkdir(exist_ok=True)
+        joblib.dump(model, BASIC_MODEL_FILE, compress=('lz4', 3))
+        logger.info(f"Saved basic model to {BASIC_MODEL_FILE}")
+    except Exception as e:
+        logger.warning(f"Could not save basic model: {e}")
+    
+    return model
+
+# Generate dummy data and load (or train) the model for basic analysis.
+# The data is kept as one NumPy array per column plus the preformatted
+# timestamps, rather than as a DataFrame. IsolationForest works on float32
+# internally, so the features are converted once here rather than on every
+# fit/scoring call
+FEATURE_COLUMNS = ['temperature', 'pressure', 'speed', 'vibration']
+# Expected normal values of the features, and what to check when a feature
+# deviates the most from its normal value
+NORMAL_VALUES = np.array([50, 100, 75, 25], dtype=np.float32)
+RECOMMENDATIONS = {
+    'temperature': 'Check cooling system',
+    'pressure': 'Inspect pressure valves',
+    'speed': 'Verify motor operation',
+    'vibration': 'Check for loose components'
+}
+dummy_data = generate_dummy_data(1000)
+data = {col: dummy_data[col].to_numpy() for col in FEATURE_COLUMNS}
+timestamps = dummy_data['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S').to_numpy()
+features = dummy_data[FEATURE_COLUMNS].to_numpy(dtype=np.float32)
+del dummy_data
+model = load_or_train_basic_model(features)
 
 # Save some predictions
-data['anomaly'] = model.predict(data[['temperature', 'pressure', 'speed', 'vibration']])
-data['anomaly_score'] = model.decision_function(data[['temperature', 'pressure', 'speed', 'vibration']])
-anomalies = data[data['anomaly'] == -1].copy()
+# (scored once on all cores; the labels follow from the sign of the scores)
+with parallel_backend('threading', n_jobs=-1):
+    scores = model.decision_function(features)
+data['anomaly'] = np.where(scores < 0, -1, 1)
+data['anomaly_score'] = scores
+anomaly_indices = np.flatnonzero(data['anomaly'] == -1)
+scorer = BatchScorer(model)
+
+# The data doesn't change after startup, so the summary is computed once
+total_readings = data['anomaly'].size
+SUMMARY_CACHE = {
+    'total_readings': total_readings,
+    'anomalies_detected': anomaly_indices.size,
+    'anomaly_percentage': anomaly_indices.size / total_readings * 100,
+    'avg_temperature': data['temperature'].mean(),
+    'avg_pressure': data['pressure'].mean(),
+    'avg_speed': data['speed'].mean(),
+    'avg_vibration': data['vibration'].mean()
+}
+
+def readings_to_records(indices, columns):
+    """Convert the given columns and the timestamps of the readings at indices to a list of dicts."""
+    # Pull each column out as a list of Python scalars (floats, or ints for
+    # the anomaly labels) at once rather than boxing reading by reading
+    keys = columns + ['timestamp']
+    values = [data[col][indices].tolist() for col in columns]
+    values.append(timestamps[indices].tolist())
+    return [dict(zip(keys, row)) for row in zip(*values)]
+
+def encode_json(payload):
+    """Encode a response payload as JSON bytes."""
+    return orjson.dumps(payload, option=JSON_OPTIONS)
+
+# The endpoints that only return the startup data are encoded to JSON once
+# too. The anomalies are the 10 with the lowest scores
+top_anomalies = anomaly_indices[np.argsort(data['anomaly_score'][anomaly_indices], kind='stable')[:10]]
+SUMMARY_JSON = encode_json(SUMMARY_CACHE)
+ANOMALIES_JSON = encode_json({
+    'anomalies': readings_to_records(
+        top_anomalies,
+        ['temperature', 'pressure', 'speed', 'vibration', 'anomaly_score']
+    )
+})
+# The latest 50 data points for time series visualization
+LATEST_DATA_JSON = encode_json({
+    'data': readings_to_records(
+        slice(-50, None),
+        ['temperature', 'pressure', 'speed', 'vibration', 'anomaly', 'anomaly_score']
+    )
+})
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -106,32 +291,11 @@ def health_check():
 
 @app.route('/api/summary', methods=['GET'])
 def get_summary():
-    return jsonify({
-        'total_readings': len(data),
-        'anomalies_detected': len(anomalies),
-        'anomaly_percentage': len(anomalies) / len(data) * 100,
-        'avg_temperature': data['temperature'].mean(),
-        'avg_pressure': data['pressure'].mean(),
-        'avg_speed': data['speed'].mean(),
-        'avg_vibration': data['vibration'].mean()
-    })
+    return Response(SUMMARY_JSON, mimetype='application/json')
 
 @app.route('/api/anomalies', methods=['GET'])
 def get_anomalies():
-    result = anomalies.sort_values('anomaly_score').head(10)
-    result_dict = []
-    for _, row in result.iterrows():
-        result_dict.append({
-            'temperature': float(row['temperature']),
-            'pressure': float(row['pressure']),
-            'speed': float(row['speed']),
-            'vibration': float(row['vibration']),
-            'timestamp': row['timestamp'].strftime('%Y-%m-%d %H:%M:%S'),
-            'anomaly_score': float(row['anomaly_score'])
-        })
-    return jsonify({
-        'anomalies': result_dict
-    })
+    return Response(ANOMALIES_JSON, mimetype='application/json')
 
 @app.route('/api/predict', methods=['POST'])
 def predict_anomaly():
@@ -142,36 +306,28 @@ def predict_anomaly():
             input_data.get('pressure', 100),
             input_data.get('speed', 75),
             input_data.get('vibration', 25)
-        ]])
+        ]], dtype=np.float32)
         
-        prediction = model.predict(sample)[0]
-        score = model.decision_function(sample)[0]
+        # predict() is decision_function() thresholded at 0, so score the
+        # sample once (batched with concurrent requests) and derive the label
+        # from the score
+        score = scorer.score(sample)
         
-        is_anomaly = prediction == -1
+        is_anomaly = score < 0
         
         response = {
-            'is_anomaly': bool(is_anomaly),
-            'anomaly_score': float(score),
+            'is_anomaly': is_anomaly,
+            'anomaly_score': score,
             'recommendation': 'Maintenance required' if is_anomaly else 'Normal operation'
         }
         
         if is_anomaly:
             # Determine which feature contributed most to the anomaly
-            feature_names = ['temperature', 'pressure', 'speed', 'vibration']
-            normal_values = [50, 100, 75, 25]  # Expected normal values
-            deviations = [abs(sample[0][i] - normal_values[i]) / normal_values[i] for i in range(4)]
-            max_deviation_idx = np.argmax(deviations)
-            
-            response['probable_cause'] = f'Abnormal {feature_names[max_deviation_idx]}'
+            deviations = np.abs(sample[0] - NORMAL_VALUES) / NORMAL_VALUES
+            probable_cause = FEATURE_COLUMNS[int(np.argmax(deviations))]
             
-            if feature_names[max_deviation_idx] == 'temperature':
-                response['recommendation'] = 'Check cooling system'
-            elif feature_names[max_deviation_idx] == 'pressure':
-                response['recommendation'] = 'Inspect pressure valves'
-            elif feature_names[max_deviation_idx] == 'speed':
-                response['recommendation'] = 'Verify motor operation'
-            elif feature_names[max_deviation_idx] == 'vibration':
-                response['recommendation'] = 'Check for loose components'
+            response['probable_cause'] = f'Abnormal {probable_cause}'
+            response['recommendation'] = RECOMMENDATIONS[probable_cause]
         
         return jsonify(response)
     except Exception as e:
@@ -180,44 +336,49 @@ def predict_anomaly():
 @app.route('/api/latest-data', methods=['GET'])
 def get_latest_data():
     # Return the latest 50 data points for time series visualization
-    result = data.tail(50).copy()
-    result_dict = []
-    for _, row in result.iterrows():
-        result_dict.append({
-            'temperature': float(row['temperature']),
-            'pressure': float(row['pressure']),
-            'speed': float(row['speed']),
-            'vibration': float(row['vibration']),
-            'timestamp': row['timestamp'].strftime('%Y-%m-%d %H:%M:%S'),
-            'anomaly': int(row['anomaly']),
-            'anomaly_score': float(row['anomaly_score'])
-        })
-    return jsonify({
-        'data': result_dict
-    })
+    return Response(LATEST_DATA_JSON, mimetype='application/json')
+
+# The distributions (per feature) of the simulated normal and anomalous readings
+NORMAL_READING_MEANS = np.array([50, 100, 75, 25])
+NORMAL_READING_STDS = np.array([5, 10, 8, 3])
+ANOMALOUS_READING_MEANS = np.array([70, 140, 40, 40])
+ANOMALOUS_READING_STDS = np.array([8, 15, 10, 6])
+
+# Random number generators of the processes serving the app, by process ID
+rngs = {}
+
+def get_rng():
+    """
+    Random number generator of the current process.
+    
+    Each process gets its own freshly seeded generator, as gunicorn forks its
+    workers from the process that imported the app, and a generator created
+    at import would be copied (with the same state) into every worker.
+    """
+    pid = os.getpid()
+    if pid not in rngs:
+        rngs[pid] = np.random.default_rng()
+    return rngs[pid]
 
 @app.route('/api/generate-reading', methods=['GET'])
 def generate_reading():
     # Generate a random reading based on normal values
     # with a small chance of anomaly
-    is_anomaly = np.random.random() < 0.1
+    rng = get_rng()
+    is_anomaly = rng.random() < 0.1
     
     if is_anomaly:
-        temp = np.random.normal(70, 8)
-        pressure = np.random.normal(140, 15)
-        speed = np.random.normal(40, 10)
-        vibration = np.random.normal(40, 6)
+        means, stds = ANOMALOUS_READING_MEANS, ANOMALOUS_READING_STDS
     else:
-        temp = np.random.normal(50, 5)
-        pressure = np.random.normal(100, 10)
-        speed = np.random.normal(75, 8)
-        vibration = np.random.normal(25, 3)
+        means, stds = NORMAL_READING_MEANS, NORMAL_READING_STDS
+    # Draw all the features at once
+    temp, pressure, speed, vibration = rng.normal(means, stds).tolist()
     
     return jsonify({
-        'temperature': float(temp),
-        'pressure': float(pressure),
-        'speed': float(speed),
-        'vibration': float(vibration),
+        'temperature': temp,
+        'pressure': pressure,
+        'speed': speed,
+        'vibration': vibration,
         'timestamp': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
     })
 
@@ -237,7 +398,7 @@ def advanced_anomaly_detection():
             input_data.get('pressure', 100),
             input_data.get('speed', 75),
             input_data.get('vibration', 25)
-        ]])
+        ]], dtype=np.float32)
         
         # Check which model to use
         model_name = input_data.get('model', 'isolation_forest')
@@ -245,15 +406,14 @@ def advanced_anomaly_detection():
             return jsonify({'error': f'Model {model_name} not available'}), 400
         
         # Make prediction
-        advanced_model = advanced_models[model_name]
-        prediction = advanced_model.predict(features)[0]
-        score = advanced_model.decision_function(features)[0]
+        # As for the basic model, the label follows from the sign of the score
+        score = advanced_scorers[model_name].score(features)
         
-        is_anomaly = prediction == -1
+        is_anomaly = score < 0
         
         response = {
-            'is_anomaly': bool(is_anomaly),
-            'anomaly_score': float(score),
+            'is_anomaly': is_anomaly,
+            'anomaly_score': score,
             'model': model_name,
             'recommendation': 'Maintenance required' if is_anomaly else 'Normal operation'
         }
@@ -263,9 +423,8 @@ def advanced_anomaly_detection():
         logger.error(f"Error in advanced anomaly detection: {str(e)}")
         return jsonify({'error': str(e)}), 400
 
-@app.route('/api/available-models', methods=['GET'])
-def available_models():
-    """List available advanced models."""
+def describe_models():
+    """Describe the basic model and the loaded advanced models."""
     models_info = {
         'basic': {
             'name': 'Basic Isolation Forest',
@@ -283,11 +442,104 @@ def available_models():
                            ['production_features'] if model_name != 'isolation_forest' else []
             }
     
-    return jsonify({
+    return {
         'models': models_info,
         'default_model': 'basic'
+    }
+
+# The models are all loaded at startup, so their descriptions are encoded once
+AVAILABLE_MODELS_JSON = encode_json(describe_models())
+
+@app.route('/api/available-models', methods=['GET'])
+def available_models():
+    """List available advanced models."""
+    return Response(AVAILABLE_MODELS_JSON, mimetype='application/json')
+
+def file_mtime(path):
+    """Modification time of a file, or None if it doesn't exist."""
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+@lru_cache(maxsize=32)
+def load_analysis_results(model_type, results_name, results_mtime, metrics_mtime):
+    """
+    Load the analysis results of a model as the JSON response body.
+    
+    results_name is the results file in ANALYSIS_RESULTS_DIR (Parquet, or
+    CSV from older analysis runs). The file modification times are part of
+    the cache key, so the results are only read again when the files change.
+    """
+    results_file = ANALYSIS_RESULTS_DIR / results_name
+    metrics_file = ANALYSIS_RESULTS_DIR / f"anomaly_metrics_{model_type}.json"
+    
+    # Load the first 50 results. Only those rows are read from a Parquet
+    # file, whose metadata holds the total number of records
+    if results_file.suffix == ".parquet":
+        parquet_file = pq.ParquetFile(results_file)
+        total_records = parquet_file.metadata.num_rows
+        first_batch = next(parquet_file.iter_batches(batch_size=50), None)
+        if first_batch is None:
+            results = parquet_file.schema_arrow.empty_table().to_pandas()
+        else:
+            results = first_batch.to_pandas()
+    else:
+        results = pd.read_csv(results_file)
+        total_records = len(results)
+        results = results.head(50)
+    
+    # Load metrics if available
+    metrics = None
+    if metrics_mtime is not None:
+        metrics = orjson.loads(metrics_file.read_bytes())
+    
+    # Format results: numeric (and boolean) columns as floats and the others
+    # as strings (missing values as null), converting a column at a time
+    numeric_columns = set(results.select_dtypes(['number', 'bool']).columns)
+    columns = list(results.columns)
+    values = [
+        results[col].to_numpy(dtype=float, na_value=np.nan).tolist() if col in numeric_columns
+        else results[col].astype(str).where(results[col].notna(), None).tolist()
+        for col in columns
+    ]
+    results_dict = [dict(zip(columns, row)) for row in zip(*values)]
+    
+    return encode_json({
+        'model': model_type,
+        'metrics': metrics,
+        'results': results_dict,
+        'total_records': total_records
+    })
+
+@lru_cache(maxsize=1)
+def list_analysis_plots(plots_mtime):
+    """
+    List the analysis plots as the JSON response body.
+    
+    The plots directory's modification time (which changes when plots are
+    added or removed) is the cache key.
+    """
+    plots_dir = ANALYSIS_RESULTS_DIR / "plots"
+    plots = []
+    for plot_file in plots_dir.glob("*.png"):
+        plots.append({
+            'name': plot_file.stem,
+            'path': f"/api/plot/{plot_file.name}",
+            'description': plot_file.stem.replace('_', ' ').title()
+        })
+    
+    return encode_json({
+        'plots': plots
     })
 
+# List the plots at startup, so that requests are served from the cache until
+# the plots directory changes
+if HAS_ADVANCED_ANALYSIS:
+    startup_plots_mtime = file_mtime(ANALYSIS_RESULTS_DIR / "plots")
+    if startup_plots_mtime is not None:
+        list_analysis_plots(startup_plots_mtime)
+
 @app.route('/api/analysis-results', methods=['GET'])
 def get_analysis_results():
     """Get results from the advanced analysis module."""
@@ -299,35 +551,19 @@ def get_analysis_results():
         model_type = request.args.get('model', 'isolation_forest')
         
         # Look for results file
-        results_file = ANALYSIS_RESULTS_DIR / f"anomaly_results_{model_type}.csv"
-        metrics_file = ANALYSIS_RESULTS_DIR / f"anomaly_metrics_{model_type}.json"
+        results_name = f"anomaly_results_{model_type}.parquet"
+        results_mtime = file_mtime(ANALYSIS_RESULTS_DIR / results_name)
+        if results_mtime is None:
+            # Fall back to the CSV results of older analysis runs
+            results_name = f"anomaly_results_{model_type}.csv"
+            results_mtime = file_mtime(ANALYSIS_RESULTS_DIR / results_name)
+        metrics_mtime = file_mtime(ANALYSIS_RESULTS_DIR / f"anomaly_metrics_{model_type}.json")
         
-        if not results_file.exists():
+        if results_mtime is None:
             return jsonify({'error': f'Results for {model_type} not found'}), 404
         
-        # Load results
-        results = pd.read_csv(results_file)
-        
-        # Load metrics if available
-        metrics = None
-        if metrics_file.exists():
-            with open(metrics_file, 'r') as f:
-                metrics = json.load(f)
-        
-        # Format results
-        results_dict = []
-        for _, row in results.head(50).iterrows():
-            row_dict = {}
-            for col in results.columns:
-                row_dict[col] = float(row[col]) if isinstance(row[col], (int, float)) else str(row[col])
-            results_dict.append(row_dict)
-        
-        return jsonify({
-            'model': model_type,
-            'metrics': metrics,
-            'results': results_dict,
-            'total_records': len(results)
-        })
+        body = load_analysis_results(model_type, results_name, results_mtime, metrics_mtime)
+        return Response(body, mimetype='application/json')
     except Exception as e:
         logger.error(f"Error retrieving analysis results: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -338,22 +574,12 @@ def get_analysis_plots():
     if not HAS_ADVANCED_ANALYSIS or not ANALYSIS_RESULTS_DIR.exists():
         return jsonify({'error': 'Analysis plots not available'}), 404
     
-    plots_dir = ANALYSIS_RESULTS_DIR / "plots"
-    if not plots_dir.exists():
+    plots_mtime = file_mtime(ANALYSIS_RESULTS_DIR / "plots")
+    if plots_mtime is None:
         return jsonify({'error': 'Plots directory not found'}), 404
     
     try:
-        plots = []
-        for plot_file in plots_dir.glob("*.png"):
-            plots.append({
-                'name': plot_file.stem,
-                'path': f"/api/plot/{plot_file.name}",
-                'description': plot_file.stem.replace('_', ' ').title()
-            })
-        
-        return jsonify({
-            'plots': plots
-        })
+        return Response(list_analysis_plots(plots_mtime), mimetype='application/json')
     except Exception as e:
         logger.error(f"Error listing analysis plots: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -367,8 +593,12 @@ def serve_plot(plot_name):
     plots_dir = ANALYSIS_RESULTS_DIR / "plots"
     plot_path = plots_dir / plot_name
     
-    if not plot_path.exists():
+    try:
+        stat = plot_path.stat()
+    except FileNotFoundError:
         return jsonify({'error': f'Plot {plot_name} not found'}), 404
+    # The ETag changes whenever the plot is rewritten
+    etag = f"{stat.st_size}-{stat.st_mtime_ns}"
     
     # Determine file type for correct mimetype
     if plot_name.endswith('.png'):
@@ -378,7 +608,14 @@ def serve_plot(plot_name):
     else:
         mimetype = 'application/octet-stream'
     
-    return send_from_directory(str(plots_dir), plot_name, mimetype=mimetype)
+    # Conditional requests get a 304 if the plot hasn't changed. The analysis
+    # overwrites the plots in place, so cached copies are revalidated rather
+    # than being treated as immutable
+    response = send_from_directory(
+        str(plots_dir), plot_name, mimetype=mimetype, conditional=True, etag=etag
+    )
+    response.headers['Cache-Control'] = 'public, no-cache'
+    return response
 
 if __name__ == '__main__':
     # Check what port to use
@@ -391,4 +628,26 @@ if __name__ == '__main__':
     else:
         logger.info("Advanced analysis is NOT available")
     
-    app.run(host='0.0.0.0', port=port, debug=True) 
\ No newline at end of file
+    if os.environ.get('FLASK_DEV') or os.name == 'nt':
+        # Flask's dev server with the debugger and reloader (also used on
+        # Windows, where gunicorn can't run)
+        app.run(host='0.0.0.0', port=port, debug=True)
+    else:
+        # Replace this process with gunicorn. The app is preloaded, so the
+        # data and model are loaded once and shared by the forked workers.
+        # The workers are threaded, so that concurrent predictions can be
+        # scored together
+        workers = os.environ.get('WEB_CONCURRENCY', '4')
+        try:
+            os.execvp('gunicorn', [
+                'gunicorn', 'app:app',
+                '--preload',
+                '--chdir', str(CURRENT_DIR),
+                '-w', workers,
+                '-k', 'gthread',
+                '--threads', '8',
+                '-b', f'0.0.0.0:{port}'
+            ])
+        except FileNotFoundError:
+            logger.error("gunicorn is not installed. Install it with: pip install gunicorn")
+            sys.exit(1) 
\ No newline at end of file
@@ -11,54 +11,29 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Print current directory and Python path
-logger.info(f"Current directory: {os.getcwd()}")
-logger.info(f"Python path: {sys.path}")
-
 # Add analysis module to path
 CURRENT_DIR = Path(__file__).resolve().parent
 ROOT_DIR = CURRENT_DIR.parent.parent.parent
 ANALYSIS_DIR = ROOT_DIR / "analysis"
 ANALYSIS_SRC_DIR = ANALYSIS_DIR / "src"
 
-logger.info(f"CURRENT_DIR: {CURRENT_DIR}")
-logger.info(f"ROOT_DIR: {ROOT_DIR}")
-logger.info(f"ANALYSIS_DIR: {ANALYSIS_DIR}")
-logger.info(f"ANALYSIS_SRC_DIR: {ANALYSIS_SRC_DIR}")
-
-# Check if src directory exists
-if ANALYSIS_SRC_DIR.exists():
-    logger.info(f"Analysis src directory exists: {ANALYSIS_SRC_DIR}")
-    
-    # List contents of src directory
-    logger.info(f"Contents of src directory:")
-    for item in ANALYSIS_SRC_DIR.iterdir():
-        logger.info(f"  - {item}")
-    
-    # Check models directory
-    models_dir = ANALYSIS_SRC_DIR / "models"
-    if models_dir.exists():
-        logger.info(f"Models directory exists: {models_dir}")
-        for item in models_dir.iterdir():
-            logger.info(f"  - {item}")
-    else:
-        logger.warning(f"Models directory does not exist: {models_dir}")
-    
-    # Check data directory
-    data_dir = ANALYSIS_SRC_DIR / "data"
-    if data_dir.exists():
-        logger.info(f"Data directory exists: {data_dir}")
-        for item in data_dir.iterdir():
+def log_directory(directory, name):
+    """Log whether a directory exists and what it contains."""
+    if directory.exists():
+        logger.info(f"{name} directory exists: {directory}")
+        for item in directory.iterdir():
             logger.info(f"  - {item}")
     else:
-        logger.warning(f"Data directory does not exist: {data_dir}")
-    
-    # Add to Python path
+        logger.warning(f"{name} directory does not exist: {directory}")
+
+def setup_path():
+    """Add the analysis src directory to the Python path."""
     sys.path.append(str(ANALYSIS_SRC_DIR))
     logger.info(f"Added to Python path: {ANALYSIS_SRC_DIR}")
     logger.info(f"Updated Python path: {sys.path}")
-    
-    # Try importing the modules
+
+def check_imports():
+    """Try importing the analysis modules the API uses and check for their functions."""
     try:
         logger.info("Trying to import models.anomaly...")
         import models.anomaly
@@ -69,12 +44,12 @@ if ANALYSIS_SRC_DIR.exists():
             logger.info("load_model function exists in models.anomaly")
         else:
             logger.warning("load_model function DOES NOT exist in models.anomaly")
-            
+        
         if hasattr(models.anomaly, 'predict_anomaly'):
             logger.info("predict_anomaly function exists in models.anomaly")
         else:
             logger.warning("predict_anomaly function DOES NOT exist in models.anomaly")
-        
+    
     except ImportError as e:
         logger.error(f"ImportError: {e}")
     except Exception as e:
@@ -90,12 +65,42 @@ if ANALYSIS_SRC_DIR.exists():
             logger.info("generate_synthetic_data function exists in data.preprocess")
         else:
             logger.warning("generate_synthetic_data function DOES NOT exist in data.preprocess")
-            
+    
     except ImportError as e:
         logger.error(f"ImportError: {e}")
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
-else:
-    logger.error(f"Analysis src directory does not exist: {ANALYSIS_SRC_DIR}")
 
-print("Diagnostics complete.") 
\ No newline at end of file
+def main():
+    """Run the import diagnostics."""
+    # Print current directory and Python path
+    logger.info(f"Current directory: {os.getcwd()}")
+    logger.info(f"Python path: {sys.path}")
+    
+    logger.info(f"CURRENT_DIR: {CURRENT_DIR}")
+    logger.info(f"ROOT_DIR: {ROOT_DIR}")
+    logger.info(f"ANALYSIS_DIR: {ANALYSIS_DIR}")
+    logger.info(f"ANALYSIS_SRC_DIR: {ANALYSIS_SRC_DIR}")
+    
+    # Check if src directory exists
+    if ANALYSIS_SRC_DIR.exists():
+        logger.info(f"Analysis src directory exists: {ANALYSIS_SRC_DIR}")
+        
+        # List contents of src directory
+        logger.info(f"Contents of src directory:")
+        for item in ANALYSIS_SRC_DIR.iterdir():
+            logger.info(f"  - {item}")
+        
+        # Check models and data directories
+        log_directory(ANALYSIS_SRC_DIR / "models", "Models")
+        log_directory(ANALYSIS_SRC_DIR / "data", "Data")
+        
+        setup_path()
+        check_imports()
+    else:
+        logger.error(f"Analysis src directory does not exist: {ANALYSIS_SRC_DIR}")
+    
+    print("Diagnostics complete.")
+
+if __name__ == "__main__":
+    main()